@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Benchmark of every decoding stage.
+
+The stages are timed on the bundled captures (data/tfMatrix*.csv), on scaled synthetic inputs, and on generated slots with up to 63 users.
+The results are printed (or written to a file) as JSON, so that they can be compared between versions.
+'''
+
+##-Imports
+import json
+import os
+import platform
+import time
+from sys import argv
+from sys import exit as sysexit
+
+import numpy as np
+
+from src.crc import crc_decode, get_crc, get_crc_poly
+from src.decode import DecodeMatrix
+from src.demod import bpsk_demod_array, qpsk_demod_array, qam16_demod_array, qam16_llr
+from src.generator import MAX_USERS, build_matrix, random_users
+from src.hamming748 import Hamming748
+from src.utils import get_matrix
+from src.viterbi import ViterbiDecoder, conv_encode
+
+##-Constants
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+CAPTURES = ('tfMatrix.csv', 'tfMatrix_2.csv', 'tfMatrix_3.csv')
+SIZES = (1_000, 10_000, 100_000) # Number of symbols (or bits) of the synthetic inputs
+
+##-Timing
+def timeit(func, *args, repeat: int = 5) -> dict[str, float | int]:
+    '''
+    Times `func(*args)`.
+
+    Args:
+        :func:   the function to time
+        :*args:  its arguments
+        :repeat: the number of runs
+
+    Returns:
+        dict: {'min': <seconds>, 'mean': <seconds>, 'repeat': <repeat>}
+    '''
+
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - t0)
+
+    return {'min': min(times), 'mean': sum(times) / len(times), 'repeat': repeat}
+
+##-Benchmarks
+def bench_captures(repeat: int) -> dict[str, dict]:
+    '''Times the stages of the decoding on the bundled captures.'''
+
+    ret = {}
+
+    for fn in CAPTURES:
+        path = os.path.join(DATA_DIR, fn)
+        m = get_matrix(path)
+
+        def retrieve_PBCH():
+            DecodeMatrix(m).retrieve_PBCH()
+
+        def decode_all():
+            DecodeMatrix(m).decode_all()
+
+        def decode_all_batch():
+            DecodeMatrix(m).decode_all('batch')
+
+        ret[fn] = {
+            'get_matrix': timeit(get_matrix, path, repeat=repeat),
+            'retrieve_PBCH': timeit(retrieve_PBCH, repeat=repeat),
+            'decode_all': timeit(decode_all, repeat=repeat),
+            'decode_all_batch': timeit(decode_all_batch, repeat=repeat),
+        }
+
+    return ret
+
+def bench_synthetic(repeat: int) -> dict[str, dict]:
+    '''Times each stage on synthetic inputs of increasing sizes.'''
+
+    rng = np.random.default_rng(0)
+    h = Hamming748()
+    viterbi = ViterbiDecoder()
+    crc = get_crc(24)
+    poly = get_crc_poly(24)
+
+    ret = {}
+    for n in SIZES:
+        symbols = (rng.standard_normal(n) + 1j * rng.standard_normal(n)) / np.sqrt(2)
+        bits = rng.integers(0, 2, n).astype(np.uint8)
+        codewords = bits[: n // 8 * 8] # Random codewords : `decode_array` reports the drops instead of raising
+        encoded = conv_encode(bits[: n // 2])
+
+        ret[str(n)] = {
+            'bpsk_demod': timeit(bpsk_demod_array, symbols, repeat=repeat),
+            'qpsk_demod': timeit(qpsk_demod_array, symbols, repeat=repeat),
+            'qam16_demod': timeit(qam16_demod_array, symbols, repeat=repeat),
+            'qam16_llr': timeit(qam16_llr, symbols, repeat=repeat),
+            'hamming748_decode': timeit(h.decode_array, codewords, repeat=repeat),
+            'viterbi_hard': timeit(viterbi.decode, encoded, 'hard', repeat=repeat),
+            'crc_decode': timeit(crc_decode, bits, poly, repeat=repeat),
+            'crc_table': timeit(crc.check, bits, repeat=repeat),
+        }
+
+    return ret
+
+def bench_generated(repeat: int) -> dict[str, dict]:
+    '''Times the decoding of all the users of generated slots (see `src.generator`), with 1 to MAX_USERS users.'''
+
+    rng = np.random.default_rng(0)
+
+    ret = {}
+    for n_users in (1, 16, MAX_USERS):
+        m = build_matrix(1, random_users(n_users, rng=rng), noise_var=0.05, rng=rng)
+
+        def decode_all():
+            DecodeMatrix(m).decode_all()
+
+        def decode_all_batch():
+            DecodeMatrix(m).decode_all('batch')
+
+        ret[str(n_users)] = {
+            'decode_all': timeit(decode_all, repeat=repeat),
+            'decode_all_batch': timeit(decode_all_batch, repeat=repeat),
+        }
+
+    return ret
+
+def run_benchmarks(repeat: int = 5) -> dict:
+    '''Runs all the benchmarks, and returns the results (with information about the environment).'''
+
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'captures': bench_captures(repeat),
+        'synthetic': bench_synthetic(repeat),
+        'generated': bench_generated(repeat),
+    }
+
+##-Parser
+def parser(argv):
+    '''Defines a very simple commandline parser for the benchmarks.'''
+
+    if '-h' in argv or '--help' in argv:
+        print(f'Usage: {argv[0]} [-r repeat] [-o output.json]')
+        sysexit()
+
+    repeat = 5
+    if '-r' in argv:
+        repeat = int(argv[argv.index('-r') + 1])
+
+    res = json.dumps(run_benchmarks(repeat), indent=4)
+
+    if '-o' in argv:
+        with open(argv[argv.index('-o') + 1], 'w') as f:
+            f.write(res + '\n')
+
+    else:
+        print(res)
+
+##-Run
+if __name__ == '__main__':
+    parser(argv)
@@ -5,11 +5,14 @@
 
 ##-Imports
 from src.utils import *
-from src.decode import DecodeMatrix, payload_to_str, test_decode_all_PBCH, test_decode_all_PDCCHU, test_decode_all_payloads
-from tests.tests_hamming import *
-from tests.tests_modulation import *
+from src.capture import convert_csv, load_matrix
+from src.stream import stream_decode
+from src.batch import run_batch
+from src.cache import ResultCache, cached_decode
+from src.channel import EQUALIZERS, equalize_matrix
+from src.decode import DecodeMatrix, payload_to_str, test_decode_all_PBCH, test_decode_all_PDCCHU, test_decode_all_payloads, test_decode_views
 
-from sys import argv
+from sys import argv, stdin, stdout, stderr
 from sys import exit as sysexit
 
 ##-Main
@@ -30,19 +33,87 @@ def test_matrix():
     # power_distrib_graph(m2)
     pass
 
-def run_tests(matrix, display=True):
-    '''Run tests'''
+def run_tests(matrix):
+    '''Run tests (nothing is plotted)'''
 
-    if display:
-        power_distrib_graph(matrix)
+    from tests import tests_hamming, tests_modulation, tests_capture, tests_viterbi, tests_stats, tests_generator, tests_registry, tests_mcs, tests_import, tests_channel, tests_ofdm, tests_plot, tests_cache, tests_batch # The tests are only imported when they are run
 
-    test_hammingDecode()
+    tests_hamming.test_hammingDecode()
+    tests_hamming.test_hammingDecodeArray()
+    tests_hamming.test_hammingEncode()
 
-    test_bpsk()
-    test_qpsk()
+    tests_modulation.test_bpsk()
+    tests_modulation.test_qpsk()
     print('bpsk and qpsk tests passed')
-    test_qam16()
+    tests_modulation.test_qam16()
     print('qam16 tests passed')
+    tests_modulation.test_demod_array()
+    tests_modulation.test_llr()
+    tests_modulation.test_modulate()
+
+    tests_viterbi.test_conv_encode()
+    tests_viterbi.test_viterbi_decode()
+    print('viterbi tests passed')
+
+    tests_capture.test_capture_roundtrip()
+    tests_capture.test_capture_bad_file()
+    tests_capture.test_stream_slots()
+    print('binary capture tests passed')
+
+    tests_stats.test_stats_disabled(matrix)
+    tests_stats.test_stats(matrix)
+    tests_stats.test_stats_merge()
+    print('stats tests passed')
+
+    tests_registry.test_registry()
+    tests_registry.test_registry_threads()
+    tests_mcs.test_mcs_table()
+    print('registry tests passed')
+
+    tests_generator.test_sync_symbols()
+    tests_generator.test_generator_roundtrip()
+    tests_generator.test_generator_noise()
+    tests_generator.test_generator_slots()
+    tests_generator.test_decode_batch()
+    tests_generator.test_decode_parallel()
+    print('generator tests passed')
+
+    print('-'*16)
+    print('Testing channel equalization:')
+    tests_channel.test_inverted_capture()
+    tests_channel.test_equalize()
+    print('channel tests passed')
+
+    print('-'*16)
+    print('Testing OFDM front end:')
+    tests_ofdm.test_ofdm_roundtrip()
+    tests_ofdm.test_ofdm_timing()
+    tests_ofdm.test_iq_file()
+    print('OFDM tests passed')
+
+    print('-'*16)
+    print('Testing plot:')
+    tests_plot.test_block_average()
+    print('plot tests passed')
+
+    print('-'*16)
+    print('Testing cache:')
+    tests_cache.test_cache()
+    tests_cache.test_cache_eviction()
+    print('cache tests passed')
+
+    print('-'*16)
+    print('Testing batch mode:')
+    tests_batch.test_list_captures()
+    tests_batch.test_decode_capture()
+    tests_batch.test_run_batch()
+    tests_batch.test_run_batch_crash()
+    print('batch tests passed')
+
+    print('-'*16)
+    print('Testing startup:')
+    tests_import.test_import_time()
+    print('import tests passed')
 
     print('-'*16)
     print('Testing decode:')
@@ -50,16 +121,171 @@ def run_tests(matrix, display=True):
     test_decode_all_PDCCHU(matrix)
 
     test_decode_all_payloads(matrix)
+    test_decode_views(matrix)
+
+def print_users(users: list[dict], verbose: bool = False):
+    '''
+    Prints the decoded data of the users (as returned by `DecodeMatrix.decode_all`).
+
+    Args:
+        :users:   the list of the decoded users
+        :verbose: if True, also prints the PBCHU, PDCCHU and payload bits of each user
+    '''
+
+    for user in users:
+        if user['user_ident'] is None: # The PBCHU block could not be decoded
+            print(f'    User #?: error: {user["error"]}')
+            continue
+
+        if user['error'] is not None:
+            print(f'    User #{user["user_ident"]}: error: {user["error"]}')
+            continue
+
+        if verbose:
+            print(f'    User #{user["user_ident"]}: PBCHU: {user["pbchu"]}')
+            print(f'    User #{user["user_ident"]}: PDCCHU: {user["pdcchu"]}')
+            print(f'    User #{user["user_ident"]}: {"".join(str(k) for k in user["payload"])}')
+
+        if not user['crc_ok']:
+            print(f'    User #{user["user_ident"]}: error with CRC decoding (incorrect)')
+
+        print(f'    User #{user["user_ident"]}: {user["text"]}')
+
+def decode_all_users(matrix, verbose: bool = False, workers: int | None = None, batched: bool = False):
+    '''
+    Decodes and prints the data of all the users of the matrix.
+
+    Args:
+        :matrix:  the matrix
+        :verbose: if True, also prints the PBCHU, PDCCHU and payload bits of each user, and the stats of the decoding
+        :workers: if not None, the PDSCH of the users are decoded in parallel by this number of threads
+        :batched: if True, the PDSCH of the users sharing an mcs are decoded together (ignored if `workers` is not None)
+    '''
+
+    d = DecodeMatrix(matrix, stats=verbose)
+    cell_ident, user_nb = d.decode_PBCH_header()
+
+    print(f'cell_ident: {cell_ident}, nb_users: {user_nb}')
+    print_users(d.decode_all(parallel_mode(workers, batched), workers), verbose)
+
+    if verbose:
+        print()
+        print_stats(d.get_stats())
+
+def decode_all_users_cached(fn: str, cache: ResultCache, equalizer: str | None = None, workers: int | None = None, batched: bool = False):
+    '''
+    Decodes and prints the data of all the users of the capture `fn`, using the results of the cache if the capture has already been decoded.
+
+    Args:
+        :fn:        the capture file
+        :cache:     the cache
+        :equalizer: None, or the equalizer applied before the decoding
+        :workers:   see `decode_all_users`
+        :batched:   see `decode_all_users`
+    '''
+
+    res = cached_decode(fn, cache, equalizer, parallel_mode(workers, batched), workers)
+
+    print(f'cell_ident: {res["cell_ident"]}, nb_users: {res["user_nb"]}')
+    print_users(res['users'])
+
+def parallel_mode(workers: int | None, batched: bool) -> str | None:
+    '''Returns the parallel mode of `DecodeMatrix.decode_all` : threads if `workers` is not None, else 'batch' if `batched`.'''
+
+    if workers is not None:
+        return 'thread'
+
+    if batched:
+        return 'batch'
+
+    return None
+
+def print_stats(stats: dict[str, dict]):
+    '''Prints the stats of a decoding (as returned by `DecodeMatrix.get_stats`).'''
+
+    print('Stats:')
+
+    for stage, seconds in stats['times'].items():
+        print(f'    {stage + ":":<24}{seconds * 1e3:10.3f} ms')
+
+    for counter, n in stats['counters'].items():
+        print(f'    {counter + ":":<24}{n:10}')
+
+def print_slot(slot_idx: int, res: dict, verbose: bool = False):
+    '''Prints the result of the decoding of a slot (as returned by `stream_decode`).'''
+
+    print(f'Slot #{slot_idx}:')
+
+    if res['error'] is not None:
+        print(f'    error: {res["error"]}')
+        return
+
+    print(f'    cell_ident: {res["cell_ident"]}, nb_users: {res["user_nb"]}')
+    print_users(res['users'], verbose)
+
+def stream_file(fn: str, verbose: bool = False):
+    '''
+    Decodes the capture `fn` slot by slot (streaming mode), and prints the results as they come.
+
+    Args:
+        :fn:      the file name (csv or binary capture), or '-' to read from the standard input
+        :verbose: if True, also prints the PBCHU and PDCCHU of each user
+    '''
+
+    if fn == '-':
+        for slot_idx, res in stream_decode(stdin.buffer):
+            print_slot(slot_idx, res, verbose)
+
+        return
+
+    with open(fn, 'rb') as f:
+        for slot_idx, res in stream_decode(f):
+            print_slot(slot_idx, res, verbose)
+
+def batch_files(paths: list[str], out_fn: str | None = None, workers: int | None = None, cache_dir: str | None = None):
+    '''
+    Decodes many captures in parallel, and writes the results as JSON Lines.
+
+    Args:
+        :paths:     the capture files and directories
+        :out_fn:    the output file name (None for the standard output)
+        :workers:   the number of worker processes (None for the number of CPUs)
+        :cache_dir: the directory of the result cache (None for no cache)
+    '''
+
+    if out_fn is None:
+        nb_ok, nb_err = run_batch(paths, stdout, workers, cache_dir)
+
+    else:
+        with open(out_fn, 'w') as f:
+            nb_ok, nb_err = run_batch(paths, f, workers, cache_dir)
+
+    print(f'{nb_ok + nb_err} captures processed: {nb_ok} decoded, {nb_err} with an error', file=stderr)
 
 def print_help(argv):
     '''Prints the help message for the parser and exits.'''
 
-    print(f'Usage: {argv[0]} [-v] [-t] matrix_filename [user_ident]')
+    print(f'Usage: {argv[0]} [-v] [-t] [-k cache_dir] [-e zf|mmse] [-j workers | -g] matrix_filename [user_ident]')
+    print(f'       {argv[0]} -c csv_filename capture_filename')
+    print(f'       {argv[0]} [-v] -s matrix_filename')
+    print(f'       {argv[0]} -p image_filename matrix_filename')
+    print(f'       {argv[0]} -b [-k cache_dir] [-j workers] [-o output.jsonl] capture_or_directory ...')
     print(f'\nExamples:')
     print(f'    To decode for user 3:                  {argv[0]} data/tfMatrix.csv 3')
     print(f'    To decode for user 3 and show more:    {argv[0]} data/tfMatrix.csv 3 -v')
     print(f'    To decode for all users:               {argv[0]} data/tfMatrix.csv')
+    print(f'    To decode all users with 4 threads:    {argv[0]} -j 4 data/tfMatrix.csv')
+    print(f'    To decode all users grouped by mcs:    {argv[0]} -g data/tfMatrix.csv')
+    print(f'    To equalize the channel first:         {argv[0]} -e zf data/tfMatrix_2.csv')
     print(f'    To run all tests:                      {argv[0]} data/tfMatrix.csv -t')
+    print(f'    To convert a csv to a binary capture:  {argv[0]} -c data/tfMatrix.csv data/tfMatrix.tfm')
+    print(f'    To decode from a binary capture:       {argv[0]} data/tfMatrix.tfm')
+    print(f'    To decode from raw IQ samples:         {argv[0]} capture.cf32')
+    print(f'    To decode a multi-slot capture:        {argv[0]} -s data/tfMatrix.csv')
+    print(f'    To draw the power of a capture:        {argv[0]} -p power.png data/tfMatrix.csv')
+    print(f'    To decode a capture from a pipe:       cat data/tfMatrix.csv | {argv[0]} -s -')
+    print(f'    To decode many captures in parallel:   {argv[0]} -b -j 4 -o results.jsonl data/')
+    print(f'    To keep the results for the next runs: {argv[0]} -k .cache data/tfMatrix.csv')
     sysexit()
 
 def parser(argv):
@@ -68,6 +294,46 @@ def parser(argv):
     if len(argv) <= 1 or '-h' in argv or '--help' in argv:
         print_help(argv) # also exists
 
+    cache_dir = None
+    if '-k' in argv:
+        idx = argv.index('-k')
+        cache_dir = argv[idx + 1]
+        del argv[idx : idx + 2]
+
+    if '-c' in argv:
+        del argv[argv.index('-c')]
+
+        if len(argv) != 3:
+            print_help(argv)
+
+        try:
+            convert_csv(argv[1], argv[2])
+        except FileNotFoundError:
+            print(f'File "{argv[1]}" not found !')
+
+        sysexit()
+
+    if '-b' in argv:
+        del argv[argv.index('-b')]
+
+        workers = None
+        if '-j' in argv:
+            idx = argv.index('-j')
+            workers = int(argv[idx + 1])
+            del argv[idx : idx + 2]
+
+        out_fn = None
+        if '-o' in argv:
+            idx = argv.index('-o')
+            out_fn = argv[idx + 1]
+            del argv[idx : idx + 2]
+
+        if len(argv) < 2:
+            print_help(argv)
+
+        batch_files(argv[1:], out_fn, workers, cache_dir)
+        sysexit()
+
     testing = False
     if '-t' in argv:
         testing = True
@@ -80,27 +346,94 @@ def parser(argv):
 
         del argv[argv.index('-v')]
 
+    if '-s' in argv:
+        del argv[argv.index('-s')]
+
+        if len(argv) != 2:
+            print_help(argv)
+
+        try:
+            stream_file(argv[1], verbose)
+        except FileNotFoundError:
+            print(f'File "{argv[1]}" not found !')
+        except ValueError as err:
+            print(f'File "{argv[1]}" could not be read: {err}')
+
+        sysexit()
+
+    workers = None
+    if '-j' in argv:
+        idx = argv.index('-j')
+        workers = int(argv[idx + 1])
+        del argv[idx : idx + 2]
+
+    plot_fn = None
+    if '-p' in argv:
+        idx = argv.index('-p')
+        plot_fn = argv[idx + 1]
+        del argv[idx : idx + 2]
+
+    equalizer = None
+    if '-e' in argv:
+        idx = argv.index('-e')
+        equalizer = argv[idx + 1]
+        del argv[idx : idx + 2]
+
+        if equalizer not in EQUALIZERS:
+            print(f'Invalid equalizer "{equalizer}" (should be in {EQUALIZERS})')
+            sysexit()
+
+    batched = False
+    if '-g' in argv:
+        batched = True
+
+        del argv[argv.index('-g')]
+
     if argv[1][0] == '-':
         print(f'Invalid argument "{argv[1]}"')
         sysexit()
 
     fn = argv[1]
+    cache = None if cache_dir is None else ResultCache(cache_dir)
+
+    if cache is not None and len(argv) == 2 and not (testing or verbose or plot_fn is not None): # Show all users, from the cache if possible
+        try:
+            decode_all_users_cached(fn, cache, equalizer, workers, batched)
+        except FileNotFoundError:
+            print(f'File "{fn}" not found !')
+        except ValueError as err:
+            print(f'error: {err}')
+
+        sysexit()
+
     try:
-        m = get_matrix(fn)
+        m = load_matrix(fn) if cache is None else cache.load_matrix(fn)
     except FileNotFoundError:
         print(f'File "{fn}" not found !')
         sysexit()
+    except ValueError as err:
+        print(f'File "{fn}" could not be read: {err}')
+        sysexit()
 
-    if testing:
+    if equalizer is not None:
+        m = equalize_matrix(m, equalizer)
+
+    if plot_fn is not None:
+        power_distrib_graph(m, plot_fn)
+
+    elif testing:
         run_tests(m)
 
     elif len(argv) == 2: # Show all users
-        test_decode_all_payloads(m)
+        try:
+            decode_all_users(m, verbose, workers, batched)
+        except ValueError as err:
+            print(f'error: {err}')
 
     else:
         user_ident = int(argv[2])
 
-        d = DecodeMatrix(m)
+        d = DecodeMatrix(m, stats=verbose)
         payload = d.get_payload_user(user_ident)
         res = payload_to_str(payload, user_ident)
 
@@ -111,6 +444,10 @@ def parser(argv):
 
         print(res)
 
+        if verbose:
+            print()
+            print_stats(d.get_stats())
+
 ##-Run
 if __name__ == '__main__':
     parser(argv)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+File defining the batch mode : decoding many captures in parallel (one capture per worker process),
+and writing the results as JSON Lines (one line per capture).
+'''
+
+##-Imports
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TextIO
+
+from src.cache import ResultCache, cached_decode
+from src.ofdm import IQ_EXTENSIONS
+
+##-Constants
+CAPTURE_EXTENSIONS = ('.csv', '.tfm') + IQ_EXTENSIONS
+
+##-Utils
+def list_captures(paths: list[str]) -> list[str]:
+    '''
+    Lists the capture files to decode.
+
+    Args:
+        :paths: files and directories. The directories are searched (not recursively) for the files with an extension in `CAPTURE_EXTENSIONS`.
+
+    Returns:
+        list[str]: the list of the files
+    '''
+
+    files = []
+
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(
+                os.path.join(path, fn) for fn in os.listdir(path)
+                if fn.endswith(CAPTURE_EXTENSIONS) and os.path.isfile(os.path.join(path, fn))
+            )
+
+        else:
+            files.append(path)
+
+    return files
+
+def user_to_json(user: dict) -> dict:
+    '''Converts a user result (from `DecodeMatrix.decode_all`) to a JSON friendly dict (the payload bits are joined in a string).'''
+
+    ret = dict(user)
+
+    if ret['payload'] is not None:
+        ret['payload'] = ''.join(str(k) for k in ret['payload'])
+
+    return ret
+
+##-Decoding
+def decode_capture(fn: str, cache_dir: str | None = None) -> dict:
+    '''
+    Decodes all the users of the capture `fn`.
+    This never raises an error : a capture that cannot be decoded gets the status 'error'.
+
+    Args:
+        :fn:        the file name (csv or binary capture)
+        :cache_dir: the directory of the result cache (None for no cache, see `ResultCache`)
+
+    Returns:
+        dict: {'file': <fn>, 'status': 'ok' | 'error', 'error': <error or None>, 'time': <seconds>, 'cell_ident': ..., 'user_nb': ..., 'users': [...]}
+    '''
+
+    ret = {'file': fn, 'status': 'ok', 'error': None, 'time': None, 'cell_ident': None, 'user_nb': None, 'users': []}
+    t0 = time.perf_counter()
+
+    try:
+        res = cached_decode(fn, None if cache_dir is None else ResultCache(cache_dir))
+        ret['cell_ident'], ret['user_nb'] = res['cell_ident'], res['user_nb']
+        ret['users'] = [user_to_json(user) for user in res['users']]
+
+    except Exception as err:
+        ret['status'] = 'error'
+        ret['error'] = f'{type(err).__name__}: {err}'
+
+    ret['time'] = time.perf_counter() - t0
+
+    return ret
+
+def _error_result(fn: str, err: BaseException) -> dict:
+    '''Returns the result of a capture that could not be decoded (see `decode_capture`).'''
+
+    return {'file': fn, 'status': 'error', 'error': f'{type(err).__name__}: {err}', 'time': None, 'cell_ident': None, 'user_nb': None, 'users': []}
+
+def _decode_isolated(fn: str, cache_dir: str | None = None) -> dict:
+    '''
+    Decodes the capture `fn` alone, in a new worker process (see `decode_capture`).
+    It is used to find out if this capture is the one that killed a worker process of the pool.
+    '''
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        try:
+            return executor.submit(decode_capture, fn, cache_dir).result()
+        except BrokenProcessPool:
+            return _error_result(fn, BrokenProcessPool('the worker process died while decoding this capture'))
+        except Exception as err:
+            return _error_result(fn, err)
+
+def run_batch(paths: list[str], out: TextIO, workers: int | None = None, cache_dir: str | None = None) -> tuple[int, int]:
+    '''
+    Decodes all the captures in `paths` in a process pool, and writes one JSON line per capture in `out`, in the order of the files.
+
+    If a worker process dies (e.g killed by the OS), the pool is broken and all its pending captures fail.
+    The first of them is then decoded alone, to know if it is the one that killed the worker (it gets the status 'error'),
+    and the following ones are given to a new pool.
+
+    Args:
+        :paths:     files and directories (see `list_captures`)
+        :out:       the output text stream
+        :workers:   the number of worker processes (default : the number of CPUs)
+        :cache_dir: the directory of the result cache (None for no cache). The captures already decoded are read from it.
+
+    Returns:
+        tuple[int, int]: (number of captures decoded, number of captures with an error)
+    '''
+
+    files = list_captures(paths)
+    nb_ok = nb_err = 0
+
+    def write(res: dict):
+        nonlocal nb_ok, nb_err
+
+        if res['status'] == 'ok':
+            nb_ok += 1
+        else:
+            nb_err += 1
+
+        out.write(json.dumps(res) + '\n')
+        out.flush()
+
+    idx = 0 # Index of the first capture whose result is not written yet
+    while idx < len(files):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(decode_capture, fn, cache_dir) for fn in files[idx:]]
+
+            for fn, future in zip(files[idx:], futures):
+                try:
+                    res = future.result()
+                except BrokenProcessPool: # A worker process died
+                    break
+                except Exception as err:
+                    res = _error_result(fn, err)
+
+                write(res)
+                idx += 1
+
+        if idx < len(files):
+            write(_decode_isolated(files[idx], cache_dir))
+            idx += 1
+
+    return nb_ok, nb_err
@@ -3,29 +3,42 @@
 
 ##-Imports
 import numpy as np
-import math
 
 ##-Functions
 def cesarDecode(userIdent,messEnc): 
     """Apply the Cesar transformation to the ASCII input to perform (trivial) decoding""" 
-    cesarKey = getCesarKey(userIdent)
-    mess = []
-    for elem in messEnc:
-        rr = (elem - cesarKey)%(0xFF)
-        mess.append(rr)
-    return mess 
+    return cesarDecodeArray(userIdent, messEnc).tolist()
 
 
 def bitToByte(array):
     """Convert a binary array into a Byte arrays"""
-    mess = []
-    nbWord = math.floor(len(array) / 8)
-    for n in range(nbWord):
-        w = 0
-        for k in range(8):
-            w += array[ n * 8 + k ] * 2**k
-        mess.append(w)
-    return mess 
+    return bitToByteArray(array).tolist()
+
+
+def cesarDecodeArray(userIdent,messEnc):
+    """Vectorized Cesar decoding of a byte array. Returns an uint8 array"""
+    cesarKey = getCesarKey(userIdent)
+    mess = (np.asarray(messEnc, dtype=np.int16) - cesarKey) % 0xFF
+    return mess.astype(np.uint8)
+
+
+def bitToByteArray(array):
+    """Convert a binary array into an uint8 array (the first bit of each byte is the least significant one). The last incomplete byte is ignored"""
+    array = np.asarray(array, dtype=np.uint8).reshape(-1)
+    nbWord = len(array) // 8
+    return np.packbits(array[:nbWord * 8], bitorder='little')
+
+def cesarEncodeArray(userIdent,mess):
+    """Vectorized Cesar encoding of a byte array (inverse of cesarDecodeArray, for the bytes lower than 0xFF). Returns an uint8 array"""
+    cesarKey = getCesarKey(userIdent)
+    messEnc = (np.asarray(mess, dtype=np.int16) + cesarKey) % 0xFF
+    return messEnc.astype(np.uint8)
+
+
+def byteToBitArray(array):
+    """Convert a byte array into a binary array (the first bit of each byte is the least significant one, as in bitToByteArray)"""
+    array = np.asarray(array, dtype=np.uint8).reshape(-1)
+    return np.unpackbits(array, bitorder='little')
 
 def toASCII(mess) -> str:
     """Convert a byte array into a comprehensive string"""
@@ -78,5 +91,14 @@ def test_bitToByte():
     assert bitToByte(np.array([0,1,1,1,1,1,0,0,0,0,0,0,1,1,0,1,1,0,1,1,1,1,0,0,0,1,0,0,1,0,0,0])) == [62, 176, 61, 18]
     assert bitToByte(np.array([1,0,0,0,1,1,1,0,1,0,0,1,1,1,1,0,0,0,0,1,1,1,0,0,1,0,1,1,1,1,1,1,1,0,1,0,0,1,1,0,0,1,1,0,1,0,0,0,0,1,0,0,1,0,0,0,0,0,0,1,0,1,1,1])) == [113, 121, 56, 253, 101, 22, 18, 232]
 
+def test_cesarDecode():
+    """Unit testing for the Cesar decoding"""
+
+    assert getCesarKey(1) == 5
+    assert cesarDecode(1, [5, 6, 255, 0]) == [0, 1, 250, 250]
+    assert cesarDecodeArray(1, np.array([5, 6, 255, 0], dtype=np.uint8)).tolist() == [0, 1, 250, 250]
+    assert bitToByteArray(np.array([1,0,1,0,1,0,1,1,1])).tolist() == [213]
+
 if __name__ == '__main__':
     test_bitToByte()
+    test_cesarDecode()
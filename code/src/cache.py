@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+File defining an on-disk cache of the decoded captures, so that the same capture is not decoded again by each job or run.
+
+The entries are content-addressed : they are named after a hash of the bytes of the capture file (not its name),
+so a capture that is modified, renamed or copied is handled correctly. The cache stores :
+    - the parsed matrix of each capture, as a binary capture (see `src.capture`, it is memory-mapped when read) ;
+    - the results of `DecodeMatrix.decode_all` (JSON), keyed by the capture, `DECODER_VERSION` and the decoding options.
+
+The total size of the cache is capped : the least recently used entries are removed first.
+The entries are written atomically, so several processes can share a cache directory.
+'''
+
+##-Imports
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from src.capture import load_capture, load_matrix, write_capture
+from src.channel import equalize_matrix
+from src.decode import DecodeMatrix
+from src.utils import N_FFT
+
+##-Constants
+DECODER_VERSION = 2 # To be incremented when the results of the decoding change, to invalidate the cached results
+MAX_BYTES = 256 * 2**20
+CHUNK_SIZE = 2**20
+
+MATRIX_EXT = '.tfm'
+RESULTS_EXT = '.json'
+
+##-Utils
+def _umask() -> int:
+    '''Returns the umask of the process (it can only be read by setting it, so it is set back at once).'''
+
+    mask = os.umask(0)
+    os.umask(mask)
+
+    return mask
+
+##-Cache
+class ResultCache:
+    '''On-disk cache of the parsed matrices and of the decoding results, with a size cap and LRU eviction.'''
+
+    def __init__(self, directory: str, max_bytes: int = MAX_BYTES):
+        '''
+        Constructor.
+
+        Args:
+            :directory: the cache directory (created if needed)
+            :max_bytes: the maximum total size of the entries
+        '''
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        os.makedirs(directory, exist_ok=True)
+
+    def digest(self, fn: str) -> str:
+        '''Returns the hash of the content of the file `fn`.'''
+
+        h = hashlib.sha256()
+
+        with open(fn, 'rb') as f:
+            while chunk := f.read(CHUNK_SIZE):
+                h.update(chunk)
+
+        return h.hexdigest()
+
+    def _path(self, key: str, ext: str) -> str:
+        return os.path.join(self.directory, key + ext)
+
+    def _results_key(self, digest: str, options: dict) -> str:
+        '''Returns the key of the results of a capture, decoded with `options`.'''
+
+        return hashlib.sha256(json.dumps([digest, DECODER_VERSION, options], sort_keys=True).encode()).hexdigest()
+
+    def _touch(self, path: str) -> bool:
+        '''Marks the entry `path` as used (for the LRU eviction). Returns False if it does not exist.'''
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+
+        return True
+
+    def _write(self, path: str, write):
+        '''Writes an entry atomically, with `write(tmp_fn)`, then evicts the oldest entries if the cache is too big.'''
+
+        fd, tmp_fn = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+
+        try:
+            write(tmp_fn)
+            os.chmod(tmp_fn, 0o666 & ~_umask()) # mkstemp creates the file readable only by its owner, and os.replace keeps its mode
+            os.replace(tmp_fn, path)
+        except BaseException:
+            os.remove(tmp_fn)
+            raise
+
+        self.evict()
+
+    ##-Entries
+    def load_matrix(self, fn: str, digest: str | None = None) -> np.ndarray:
+        '''
+        Returns the matrix of the capture `fn` (see `load_matrix`), from the cache if it has already been parsed.
+
+        Args:
+            :fn:     the capture file
+            :digest: the hash of the capture (computed if None)
+        '''
+
+        if digest is None:
+            digest = self.digest(fn)
+
+        path = self._path(digest, MATRIX_EXT)
+
+        if self._touch(path):
+            try:
+                return load_capture(path)
+            except (FileNotFoundError, ValueError): # Evicted by another process, or not completely written
+                pass
+
+        matrix = load_matrix(fn)
+        self._write(path, lambda tmp_fn: write_capture(tmp_fn, matrix, N_FFT, np.complex128))
+
+        return matrix
+
+    def get_results(self, digest: str, options: dict) -> dict | None:
+        '''
+        Returns the cached results of a capture, or None if they are not in the cache.
+
+        Args:
+            :digest:  the hash of the capture
+            :options: the decoding options (JSON friendly)
+        '''
+
+        path = self._path(self._results_key(digest, options), RESULTS_EXT)
+
+        if not self._touch(path):
+            return None
+
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put_results(self, digest: str, options: dict, results: dict):
+        '''
+        Stores the results of a capture.
+
+        Args:
+            :digest:  the hash of the capture
+            :options: the decoding options (JSON friendly)
+            :results: the results (JSON friendly)
+        '''
+
+        def write(tmp_fn: str):
+            with open(tmp_fn, 'w') as f:
+                json.dump(results, f)
+
+        self._write(self._path(self._results_key(digest, options), RESULTS_EXT), write)
+
+    ##-Eviction
+    def size(self) -> int:
+        '''Returns the total size of the entries.'''
+
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        '''Returns the entries, as (last use, size, path).'''
+
+        entries = []
+
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith((MATRIX_EXT, RESULTS_EXT)):
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue
+
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+
+        return entries
+
+    def evict(self):
+        '''Removes the least recently used entries until the total size is at most `max_bytes`.'''
+
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+
+            try:
+                os.remove(path)
+            except FileNotFoundError: # Already removed by another process
+                pass
+
+            total -= size
+
+    def clear(self):
+        '''Removes all the entries.'''
+
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+##-Decoding
+def cached_decode(fn: str, cache: ResultCache | None = None, equalizer: str | None = None, parallel: str | None = None, workers: int | None = None) -> dict:
+    '''
+    Decodes all the users of the capture `fn`, or returns the results from the cache.
+    The parallel mode does not change the results, so it is not part of the key.
+
+    Args:
+        :fn:        the capture file
+        :cache:     the cache (None to always decode)
+        :equalizer: None, or the equalizer applied before the decoding (see `equalize_matrix`)
+        :parallel:  the parallel mode of `DecodeMatrix.decode_all`
+        :workers:   the number of workers of `DecodeMatrix.decode_all`
+
+    Returns:
+        dict: {'cell_ident': <cell_ident>, 'user_nb': <user_nb>, 'users': <result of `DecodeMatrix.decode_all`>, 'cached': <True if it comes from the cache>}
+    '''
+
+    options = {'equalizer': equalizer}
+
+    if cache is None:
+        matrix = load_matrix(fn)
+    else:
+        digest = cache.digest(fn)
+        res = cache.get_results(digest, options)
+
+        if res is not None:
+            return res | {'cached': True}
+
+        matrix = cache.load_matrix(fn, digest)
+
+    if equalizer is not None:
+        matrix = equalize_matrix(matrix, equalizer)
+
+    d = DecodeMatrix(matrix)
+    cell_ident, user_nb = d.decode_PBCH_header()
+    res = {'cell_ident': cell_ident, 'user_nb': user_nb, 'users': d.decode_all(parallel, workers)}
+
+    if cache is not None:
+        cache.put_results(digest, options, res)
+
+    return res | {'cached': False}
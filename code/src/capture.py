@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+File defining a compact binary format for the T/F matrices, that can be memory-mapped.
+
+Layout (little endian):
+    - a 32 bytes header: magic (4 bytes, b'TFM1'), version (uint16), dtype code (uint16),
+      FFT size (uint32), N_Re (uint32), number of symbols (uint32), 12 reserved bytes ;
+    - the samples, as raw interleaved complex numbers (real, imag), row by row (n_symbols rows of N_Re samples).
+
+The samples are stored after the removal of the unused subcarriers (as returned by `get_matrix`).
+'''
+
+##-Imports
+import struct
+
+import numpy as np
+
+from src.ofdm import IQ_EXTENSIONS, load_iq
+from src.utils import N_FFT, get_matrix
+
+##-Constants
+MAGIC = b'TFM1'
+VERSION = 1
+
+HEADER = struct.Struct('<4sHHIII12x')
+
+DTYPE_CODES = {
+    0: np.dtype('<c8'),  # complex64
+    1: np.dtype('<c16'), # complex128
+}
+
+##-Functions
+def read_capture_header(f) -> dict[str, int | np.dtype]:
+    '''
+    Reads and checks the header of a binary capture.
+
+    Args:
+        :f: a binary file object, positioned at the beginning of the capture
+
+    Returns:
+        dict: {'fft_size': <fft_size>, 'n_re': <n_re>, 'n_symbols': <n_symbols>, 'dtype': <dtype>}
+    '''
+
+    raw = f.read(HEADER.size)
+
+    if len(raw) < HEADER.size:
+        raise ValueError('read_capture_header: truncated header')
+
+    magic, version, dtype_code, fft_size, n_re, n_symbols = HEADER.unpack(raw)
+
+    if magic != MAGIC:
+        raise ValueError('read_capture_header: not a binary capture (bad magic)')
+
+    if version != VERSION:
+        raise ValueError(f'read_capture_header: unsupported version {version}')
+
+    if dtype_code not in DTYPE_CODES:
+        raise ValueError(f'read_capture_header: unknown dtype code {dtype_code}')
+
+    return {'fft_size': fft_size, 'n_re': n_re, 'n_symbols': n_symbols, 'dtype': DTYPE_CODES[dtype_code]}
+
+def write_capture(fn: str, matrix: np.ndarray, fft_size: int = N_FFT, dtype: type = np.complex64):
+    '''
+    Writes `matrix` to the binary capture `fn`.
+
+    Args:
+        :fn:       the output file name
+        :matrix:   the matrix, of shape (n_symbols, n_re)
+        :fft_size: the size of the FFT the matrix comes from
+        :dtype:    the complex dtype used to store the samples (np.complex64 or np.complex128)
+    '''
+
+    matrix = np.asarray(matrix)
+
+    if matrix.ndim != 2:
+        raise ValueError('write_capture: the matrix should be two dimensional')
+
+    dtype = np.dtype(dtype).newbyteorder('<')
+    dtype_code = [code for code in DTYPE_CODES if DTYPE_CODES[code] == dtype]
+
+    if dtype_code == []:
+        raise ValueError(f'write_capture: unsupported dtype {dtype}')
+
+    n_symbols, n_re = matrix.shape
+
+    with open(fn, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, dtype_code[0], fft_size, n_re, n_symbols))
+        f.write(np.ascontiguousarray(matrix, dtype=dtype).tobytes())
+
+def load_capture(fn: str, mmap: bool = True) -> np.ndarray:
+    '''
+    Loads the binary capture `fn`.
+
+    Args:
+        :fn:   the file name
+        :mmap: if True, the file is memory-mapped (read only) instead of being read
+
+    Returns:
+        np.ndarray: the matrix, of shape (n_symbols, n_re)
+    '''
+
+    with open(fn, 'rb') as f:
+        header = read_capture_header(f)
+
+        shape = (header['n_symbols'], header['n_re'])
+
+        if not mmap or 0 in shape:
+            return np.fromfile(f, dtype=header['dtype'], count=shape[0] * shape[1]).reshape(shape)
+
+    return np.memmap(fn, dtype=header['dtype'], mode='r', offset=HEADER.size, shape=shape)
+
+def is_capture(fn: str) -> bool:
+    '''Checks if the file `fn` is a binary capture (i.e if it starts with the magic number).'''
+
+    with open(fn, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+def convert_csv(csv_fn: str, out_fn: str, dtype: type = np.complex64):
+    '''
+    Converts the csv file `csv_fn` (as read by `get_matrix`) into the binary capture `out_fn`.
+
+    Args:
+        :csv_fn: the csv file name
+        :out_fn: the output file name
+        :dtype:  the complex dtype used to store the samples
+    '''
+
+    write_capture(out_fn, get_matrix(csv_fn), N_FFT, dtype)
+
+def load_matrix(fn: str) -> np.ndarray:
+    '''
+    Loads the matrix from `fn`, which can be a csv file, a binary capture (which is memory-mapped),
+    or a raw IQ file (with an extension in `IQ_EXTENSIONS`, which is OFDM demodulated).
+
+    Args:
+        :fn: the file name
+
+    Returns:
+        np.ndarray: the matrix, of shape (n_symbols, 624)
+    '''
+
+    if is_capture(fn):
+        return load_capture(fn)
+
+    if fn.endswith(IQ_EXTENSIONS):
+        return load_iq(fn)
+
+    return get_matrix(fn)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+File defining the channel estimation and the equalization of a matrix.
+
+The first two symbols of a matrix are the synchronisation symbols, which are known (see `sync_symbols`).
+The channel of each subcarrier is estimated by dividing them by the received ones, and the whole matrix is
+then equalized at once (zero-forcing or MMSE), before being given to `DecodeMatrix`.
+'''
+
+##-Imports
+import numpy as np
+
+from src.utils import sync_symbols
+
+##-Constants
+EQUALIZERS = ('zf', 'mmse')
+TIME_INTERPOLATIONS = ('mean', 'linear')
+
+##-Estimation
+def _smooth_freq(h: np.ndarray, window: int) -> np.ndarray:
+    '''
+    Smooths `h` along the subcarriers (the last axis) with a centered moving average of `window` subcarriers
+    (the average is taken on the available subcarriers at the edges).
+    '''
+
+    half = window // 2
+    n = h.shape[-1]
+
+    cumsum = np.zeros(h.shape[:-1] + (n + 1,), dtype=h.dtype)
+    np.cumsum(h, axis=-1, out=cumsum[..., 1:])
+
+    lo = np.maximum(np.arange(n) - half, 0)
+    hi = np.minimum(np.arange(n) + half + 1, n)
+
+    return (cumsum[..., hi] - cumsum[..., lo]) / (hi - lo)
+
+def estimate_channel(matrix: np.ndarray, freq_window: int = 1, time: str = 'mean') -> np.ndarray:
+    '''
+    Estimates the channel of each subcarrier from the synchronisation symbols.
+
+    Args:
+        :matrix:      the matrix, of shape (n_symbols, 624)
+        :freq_window: the number of subcarriers of the moving average applied to the estimate (1 for no smoothing)
+        :time:        'mean' to average the estimates of the two synchronisation symbols (the channel is considered constant during the slot),
+                      'linear' to extrapolate them linearly on the following symbols (to follow a slowly varying channel)
+
+    Returns:
+        np.ndarray: the channel, of shape (1, 624) for 'mean' and (n_symbols, 624) for 'linear'
+    '''
+
+    if time not in TIME_INTERPOLATIONS:
+        raise ValueError(f'estimate_channel: time should be in {TIME_INTERPOLATIONS}, but "{time}" was found !')
+
+    h = matrix[:2] / sync_symbols(matrix.shape[1])
+
+    if freq_window > 1:
+        h = _smooth_freq(h, freq_window)
+
+    if time == 'mean':
+        return h.mean(axis=0, keepdims=True)
+
+    t = np.arange(matrix.shape[0])[:, np.newaxis]
+
+    return h[0] + t * (h[1] - h[0])
+
+def estimate_noise_var(matrix: np.ndarray) -> float:
+    '''
+    Estimates the variance of the noise from the synchronisation symbols :
+    the two raw channel estimates differ only by the noise (whose variance is halved by the amplitude sqrt(2) of the symbols).
+
+    Args:
+        :matrix: the matrix, of shape (n_symbols, 624)
+    '''
+
+    h = matrix[:2] / sync_symbols(matrix.shape[1])
+
+    return float(np.mean(np.abs(h[0] - h[1])**2))
+
+##-Equalization
+def equalize(matrix: np.ndarray, h: np.ndarray, method: str = 'zf', noise_var: float = 0.0) -> np.ndarray:
+    '''
+    Equalizes the matrix with the channel `h`.
+
+    Args:
+        :matrix:    the matrix, of shape (n_symbols, 624)
+        :h:         the channel (as returned by `estimate_channel`)
+        :method:    'zf' for zero-forcing (y / h), 'mmse' for conj(h) * y / (|h|^2 + noise_var).
+                    The MMSE equalizer reduces the noise on the faded subcarriers, but also shrinks their symbols.
+        :noise_var: the variance of the noise (for 'mmse'), relative to the power of the symbols (which is 1)
+
+    Returns:
+        np.ndarray: the equalized matrix (the subcarriers with a null channel are set to 0)
+    '''
+
+    if method == 'zf':
+        power = np.abs(h)**2
+    elif method == 'mmse':
+        power = np.abs(h)**2 + noise_var
+    else:
+        raise ValueError(f'equalize: method should be in {EQUALIZERS}, but "{method}" was found !')
+
+    w = np.divide(np.conj(h), power, out=np.zeros(np.broadcast(h, power).shape, dtype=np.complex128), where=power > 0)
+
+    return matrix * w
+
+def equalize_matrix(matrix: np.ndarray, method: str = 'zf', freq_window: int = 1, time: str = 'mean') -> np.ndarray:
+    '''
+    Estimates the channel from the synchronisation symbols, and equalizes the matrix (see `estimate_channel` and `equalize`).
+
+    Example:
+        >>> d = DecodeMatrix(equalize_matrix(get_matrix('data/tfMatrix_2.csv')))
+
+    Returns:
+        np.ndarray: the equalized matrix (its synchronisation symbols are equalized too)
+    '''
+
+    noise_var = estimate_noise_var(matrix) if method == 'mmse' else 0.0
+
+    return equalize(matrix, estimate_channel(matrix, freq_window, time), method, noise_var)
@@ -35,18 +35,115 @@ def create_g(crcSize,positions):
         gx[k] = 1
     return gx 
 
+# Positions of the 1 in the CRC polynoms (position k is the coefficient of x^(crcSize - k))
+CRC_POSITIONS = {
+    8: [1,2,8],
+    16: [2,15,16],
+    24: [1,3,6,7,8,10,11,13,14,16,18,19,20,22,24],
+    32: [1,2,4,5,7,8,10,11,12,16,22,23,26,32],
+}
+
+_CRC_POLYS = {}
+
 def get_crc_poly(crcSize):
-    """Returns the generated CRC polynoms for the given size"""
+    """Returns the generated CRC polynoms for the given size. It is generated once, and returned as a read only array"""
+
+    if crcSize not in CRC_POSITIONS:
+        raise ValueError(f'get_crc_poly: unsupported CRC size {crcSize}')
+
+    if crcSize not in _CRC_POLYS:
+        gx = create_g(crcSize, CRC_POSITIONS[crcSize])
+        gx.flags.writeable = False
+        _CRC_POLYS[crcSize] = gx
+
+    return _CRC_POLYS[crcSize]
+
+
+##-Table driven CRC
+class CRC:
+    """
+    Table driven CRC, processing the data a byte at a time.
+
+    The bits are read most significant first (as in `crc_decode`), with an initial value of 0 and no final xor,
+    so that the remainder of a codeword (data followed by its CRC) is 0.
+    """
+
+    def __init__(self, crcSize):
+        """Builds the 256 entries table for the CRC of size crcSize (8, 16, 24 or 32)"""
+
+        if crcSize not in CRC_POSITIONS:
+            raise ValueError(f'CRC: unsupported CRC size {crcSize}')
+
+        self.size = crcSize
+        self.mask = (1 << crcSize) - 1
+        self.poly = sum(1 << (crcSize - k) for k in CRC_POSITIONS[crcSize]) & self.mask # Without the leading x^crcSize
+
+        top_bit = 1 << (crcSize - 1)
+        self.table = []
+        for byte in range(256):
+            reg = byte << (crcSize - 8)
+            for _ in range(8):
+                reg = ((reg << 1) ^ self.poly) if reg & top_bit else (reg << 1)
+            self.table.append(reg & self.mask)
+
+    def compute_bytes(self, data, crc=0):
+        """Returns the remainder of the division of data * x^crcSize by the generator, data being a bytes-like object"""
+
+        shift = self.size - 8
+        mask = self.mask
+        table = self.table
+
+        for byte in bytes(data):
+            crc = ((crc << 8) & mask) ^ table[((crc >> shift) ^ byte) & 0xFF]
+
+        return crc
+
+    def compute(self, bits):
+        """Returns the remainder of the division of bits * x^crcSize by the generator (bits being a binary array)"""
+
+        bits = np.asarray(bits, dtype=np.uint8).reshape(-1)
+
+        # Leading zeros do not change the remainder, so the bits are padded at the front to get whole bytes
+        pad = (-len(bits)) % 8
+        packed = np.packbits(np.concatenate((np.zeros(pad, dtype=np.uint8), bits)))
+
+        return self.compute_bytes(packed.tobytes())
+
+    def check(self, bits):
+        """Check the CRC of the binary array bits (data followed by its CRC). Returns True if the CRC is correct"""
 
-    if crcSize == 8:
-        gx = create_g(crcSize,[1,2,8])
-    elif crcSize == 16:
-        gx = create_g(crcSize,[2,15,16])
-    elif crcSize == 24:
-        gx = create_g(crcSize,[1,3,6,7,8,10,11,13,14,16,18,19,20,22,24])
-    elif crcSize == 32:
-        gx = create_g(crcSize,[1,2,4,5,7,8,10,11,12,16,22,23,26,32])
-    return gx
+        # As the generator is not divisible by x, bits is divisible by the generator iff bits * x^crcSize is.
+        return self.compute(bits) == 0
+
+    def encode(self, bits):
+        """Returns the binary array bits followed by its CRC"""
+
+        crc = self.compute(bits)
+        crc_bits = [(crc >> (self.size - 1 - k)) & 1 for k in range(self.size)]
+
+        return np.concatenate((np.asarray(bits, dtype=np.uint8).reshape(-1), np.array(crc_bits, dtype=np.uint8)))
+
+
+# The tables are computed once, at import
+CRC_ENGINES = {crcSize: CRC(crcSize) for crcSize in CRC_POSITIONS}
+
+def get_crc(crcSize):
+    """Returns the table driven CRC engine for the given size"""
+
+    if crcSize not in CRC_ENGINES:
+        raise ValueError(f'get_crc: unsupported CRC size {crcSize}')
+
+    return CRC_ENGINES[crcSize]
+
+def crc_check(data, crcSize):
+    """Check the CRC of the binary array data with the table driven engine. Returns 1 if the CRC is correct and 0 otherwise"""
+
+    return int(get_crc(crcSize).check(data))
+
+def crc_encode(data, crcSize):
+    """Appends the CRC of size crcSize to the binary array data"""
+
+    return get_crc(crcSize).encode(data)
 
 
 def test_crcGen():
@@ -67,7 +164,30 @@ def test_crcDecode():
     assert crc == 0
 
 
+def test_crcTable():
+    rng = np.random.default_rng(0)
+
+    for sizeCRC in (8, 16, 24, 32):
+        gx = get_crc_poly(sizeCRC)
+
+        for n in (40, 45, 203):
+            seq = rng.integers(0, 2, n)
+            assert crc_check(seq, sizeCRC) == crc_decode(seq, gx)
+
+            coded = crc_encode(seq, sizeCRC)
+            assert len(coded) == n + sizeCRC
+            assert crc_check(coded, sizeCRC) == 1
+            assert crc_decode(coded, gx) == 1
+
+            coded[n // 2] ^= 1
+            assert crc_check(coded, sizeCRC) == 0
+
+    seq = np.array([0,1,1,0,1,0,0,0,0,0,0,0,0,1,1,0,0,1,0,0,1,0,1,0,0,1,1,0,1,1,0,0,0,0,0,0,0,0,0,0,0,1,0,1,1,1])
+    assert crc_check(seq, 8) == 1
+
+
 
 if __name__ == '__main__':
     test_crcGen()
     test_crcDecode()
+    test_crcTable()
@@ -2,58 +2,75 @@
 # -*- coding: utf-8 -*-
 
 ##-Imports
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
 import numpy as np
-import sk_dsp_comm.fec_conv as fec
 
-from src.binary_transformation import bitToByte, cesarDecode, toASCII
-from src.crc import crc_decode, get_crc_poly
-from src.demod import bpsk_demod, qpsk_demod, qam16_demod
-from src.hamming748 import Hamming748
+from src.binary_transformation import bitToByteArray, cesarDecodeArray
+from src.demod import llr_demod_array
+from src.mcs import PDCCHU_nb_of_rb, get_PDCCHU_mcs, get_PDSCH_mcs
+from src.registry import registry
+from src.stats import Stats, stage
 from src.utils import bin2dec, flatten_index, get_matrix
 
 ##-Utils
-def demod_decode_block(block: list[np.complex128], mcs: int = 0) -> list[int]:
+def _hamming_decode(demoded: np.ndarray, stats: Stats | None = None) -> list[int]:
+    '''Decodes `demoded` with Hamming748 (as `Hamming748.decode`), counting the corrected and dropped codewords in `stats`.'''
+
+    if stats is None:
+        return registry.hamming748().decode(demoded)
+
+    with stats.stage('fec'):
+        decoded, corrected, dropped = registry.hamming748().decode_array(demoded)
+
+    stats.count('codewords_decoded', len(corrected))
+    stats.count('hamming_corrected', corrected.sum())
+    stats.count('hamming_dropped', dropped.sum())
+
+    if dropped.any():
+        raise ValueError('Packet cannot be corrected, it has to be dropped.')
+
+    return decoded.tolist()
+
+def demod_decode_block(block: list[np.complex128], mcs: int = 0, stats: Stats | None = None) -> list[int]:
     '''
     Demods (using 2QAM, 4QAM or 16QAM according to `mcs`) and then decodes (using Hamming748) the 48 bits block into a 24 bits block.
 
     Args:
         :block: the complex block to demod and decode
-        :mcs:   an integer indicating which demodulation algorithm to use. Possible values:
+        :mcs:   an integer indicating which demodulation algorithm to use (see `src.mcs.PDCCHU_MCS_TABLE`). Possible values:
                     0 : bpsk, Hamming748
                     1 : not implemented in this project
                     2 : qpsk, Hamming748
                     3 : not implemented in this project
+        :stats: if not None, the instrumentation of the decoding (see `src.stats`)
     '''
 
-    #---Demodulation
-    if mcs == 0:
-        demoded = bpsk_demod(block)
-
-    elif mcs == 1:
-        raise NotImplementedError('Not implemented in this project')
+    demod = get_PDCCHU_mcs(mcs)['demod']
 
-    elif mcs == 2:
-        demoded = qpsk_demod(block)
+    #---Demodulation
+    with stage(stats, 'demod'):
+        demoded = demod(block)
 
-    elif mcs == 3:
-        raise NotImplementedError('Not implemented in this project')
-
-    else:
-        raise ValueError(f'mcs should be in [0 ; 3], but {mcs} was found !')
+    if stats is not None:
+        stats.count('symbols_demodulated', len(block))
 
     #---Decoding
-    h = Hamming748()
-    decoded = h.decode(demoded)
+    decoded = _hamming_decode(demoded, stats)
 
     return decoded
 
-def demod_decode_PDSCH_block(block: list[np.complex128], mcs: int) -> list[int]:
+def demod_decode_PDSCH_block(block: list[np.complex128], mcs: int, soft: bool = True, stats: Stats | None = None) -> list[int]:
     '''
     Demodulates and decodes a PDSCH block according to the `mcs`.
 
+    With `soft`, the convolutional code is decoded with soft decisions :
+    the demodulator computes the LLR of each bit, which are given to the Viterbi decoder.
+
     Args:
         :block: the complex block to demod and decode
-        :mcs: an integer indicating which demodulation algorithm to use. Possible values:
+        :mcs: an integer indicating which demodulation algorithm to use (see `src.mcs.PDSCH_MCS_TABLE`). Possible values:
             mcs % 5:
                 0 for bpsk,
                 1 for qpsk,
@@ -69,66 +86,288 @@ def demod_decode_PDSCH_block(block: list[np.complex128], mcs: int) -> list[int]:
                 5 for 1/2 Hamming748 (implemented),
                 6 for 2/3 Hamming128,
                 7 for 3/4 Hamming2416
+        :soft: if True, use soft decision decoding for the convolutional code
+        :stats: if not None, the instrumentation of the decoding (see `src.stats`)
     '''
 
+    entry = get_PDSCH_mcs(mcs)
+    demod, bits_per_symbol = registry.demod(mcs)
+
+    #---Soft demodulation and decoding (convolutional code)
+    if soft and entry['code'] == 'conv':
+        with stage(stats, 'demod'):
+            llr = llr_demod_array(block, bits_per_symbol)
+
+        with stage(stats, 'fec'):
+            decoded = registry.viterbi().decode(llr, 'soft').tolist()
+
+        if stats is not None:
+            stats.count('symbols_demodulated', len(block))
+            stats.count('viterbi_blocks_decoded')
+
+        return decoded
+
     #---Demodulation
-    if mcs % 5 == 0:
-        demoded = bpsk_demod(block)
-    elif mcs % 5 == 1:
-        demoded = qpsk_demod(block)
-    elif mcs % 5 == 2:
-        demoded = qam16_demod(block)
-    else:
-        raise NotImplementedError('Not implemented in this project')
+    with stage(stats, 'demod'):
+        demoded = demod(block)
 
-    #---Decoding
-    if mcs // 5 == 1:
-        cc1 = fec.FECConv(('1011011', '1111001'), 6) # Create a 1/2 convolutional code object (brave AI)
-        arr = np.array(demoded).astype(int)
-        decoded_ = cc1.viterbi_decoder(arr, 'hard')
+    if stats is not None:
+        stats.count('symbols_demodulated', len(block))
 
-        decoded = [int(k) for k in decoded_]
+    #---Decoding
+    if entry['code'] == 'conv':
+        with stage(stats, 'fec'):
+            decoded = registry.fec(mcs).decode(demoded, 'hard').tolist()
 
-    elif mcs // 5 == 5:
-        h = Hamming748()
-        decoded = h.decode(demoded)
+        if stats is not None:
+            stats.count('viterbi_blocks_decoded')
 
     else:
-        raise NotImplementedError('Not implemented in this project')
+        decoded = _hamming_decode(demoded, stats)
 
     return decoded
 
-def payload_to_str(payload: list[int], user_ident: int) -> str:
+def get_region(flattened_mat: np.ndarray, symb_start: int, rb_start: int, nb_of_rb: int) -> np.ndarray:
+    '''
+    Returns the region of `nb_of_rb` resource blocks starting at the symbol `symb_start` and at the resource block `rb_start`.
+    The result is a view on `flattened_mat` (no copy).
+
+    Args:
+        :flattened_mat: the flattened matrix (without the synchronisation symbols)
+        :symb_start:    the index of the first symbol (starting from 1, the synchronisation symbols included)
+        :rb_start:      the index of the first resource block (starting from 1)
+        :nb_of_rb:      the number of resource blocks (12 subcarriers each)
+    '''
+
+    beg_index = flatten_index(symb_start - 3, (rb_start - 1) * 12)
+
+    return flattened_mat[beg_index : beg_index + 12 * nb_of_rb]
+
+def payload_to_array(payload: list[int] | np.ndarray, user_ident: int) -> np.ndarray:
+    '''Converts a data block into the decoded message, as an uint8 array.'''
+
+    msg = bitToByteArray(payload)
+
+    return cesarDecodeArray(user_ident, msg)
+
+def payload_to_bytes(payload: list[int] | np.ndarray, user_ident: int) -> bytes:
+    '''Converts a data block into the decoded message, as bytes.'''
+
+    return payload_to_array(payload, user_ident).tobytes()
+
+def payload_to_memoryview(payload: list[int] | np.ndarray, user_ident: int) -> memoryview:
+    '''Converts a data block into the decoded message, as a memoryview on the decoded array (no copy).'''
+
+    return memoryview(payload_to_array(payload, user_ident))
+
+def payload_to_str(payload: list[int] | np.ndarray, user_ident: int) -> str:
     '''Converts a data block into an ASCII string.'''
 
-    msg = bitToByte(payload)
-    clear_msg = cesarDecode(user_ident, msg)
+    return payload_to_bytes(payload, user_ident).decode('latin-1') # Each byte is mapped to the character with the same code
+
+def decode_PDSCH(flattened_mat: np.ndarray | list[np.complex128], user_PDCCHU_data: dict[str, int], soft: bool = True, stats: Stats | None = None) -> tuple[list[int], bool]:
+    '''
+    Demods and decodes the PDSCH of a user from the flattened matrix, and checks its CRC.
+
+    Args:
+        :flattened_mat:    the flattened matrix (without the synchronisation symbols)
+        :user_PDCCHU_data: the PDCCHU of the user (as returned by `DecodeMatrix.decode_PDCCHU_user`)
+        :soft:             if True, the convolutional code is decoded with soft decisions
+        :stats:            if not None, the instrumentation of the decoding (see `src.stats`)
+
+    Returns:
+        tuple[list[int], bool]: (decoded bits, True if the CRC is correct)
+    '''
+
+    modulated_data = get_region(flattened_mat, user_PDCCHU_data['symb_start'], user_PDCCHU_data['rb_start'], user_PDCCHU_data['rb_size'])
+
+    decoded = demod_decode_PDSCH_block(modulated_data, user_PDCCHU_data['mcs'], soft, stats)
+
+    #-Check the CRC
+    with stage(stats, 'crc'):
+        crc_ok = registry.crc(user_PDCCHU_data['crc_flag']).check(decoded)
+
+    if stats is not None:
+        stats.count('crc_checked')
+        stats.count('crc_failed', not crc_ok)
+
+    return decoded, crc_ok
+
+def _decode_PDSCH_no_raise(flattened_mat: np.ndarray, user_PDCCHU_data: dict[str, int], soft: bool, stats: Stats | None = None) -> tuple[list[int] | None, bool, str | None]:
+    '''Same as `decode_PDSCH`, but returns the error message instead of raising it : (decoded bits, CRC status, error).'''
+
+    try:
+        with stage(stats, 'pdsch'):
+            decoded, crc_ok = decode_PDSCH(flattened_mat, user_PDCCHU_data, soft, stats)
+
+    except (ValueError, NotImplementedError) as err:
+        return None, False, str(err)
+
+    return decoded, crc_ok, None
+
+def _decode_PDSCH_shared(shm_name: str, shape: tuple[int], dtype: str, user_PDCCHU_data: dict[str, int], soft: bool, with_stats: bool = False) -> tuple[list[int] | None, bool, str | None, dict | None]:
+    '''
+    Worker for the process pool : decodes the PDSCH of a user from the flattened matrix stored in the shared memory `shm_name`.
+    With `with_stats`, the stats of the worker are also returned (as a dict), to be merged by the parent process.
+    '''
+
+    shm = SharedMemory(name=shm_name) # The memory is unlinked by the parent process
+    stats = Stats() if with_stats else None
+
+    try:
+        flattened_mat = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        flattened_mat.flags.writeable = False # Shared by all the workers : a write would change the matrix of the other users
+        ret = _decode_PDSCH_no_raise(flattened_mat, user_PDCCHU_data, soft, stats)
+        del flattened_mat
+
+    finally:
+        shm.close()
+
+    return ret + (stats.as_dict() if with_stats else None,)
+
+def _decode_PDSCH_batch(flattened_mat: np.ndarray, pdcchu_lst: list[dict[str, int]], soft: bool, stats: Stats | None = None) -> list[tuple[list[int] | None, bool, str | None]]:
+    '''
+    Decodes the PDSCH of several users, grouped by mcs : each group is demodulated and decoded in a single call.
+        - Convolutional code : the regions of the users with the same mcs and the same length are stacked, and decoded by `ViterbiDecoder.decode_batch` ;
+        - Hamming748 : the regions of the users with the same mcs are concatenated, decoded at once, and split back by offsets.
+
+    The results are the same as the ones of `_decode_PDSCH_no_raise` for each user.
+    With soft decisions, the LLRs of each user are computed with its own noise variance, as in the sequential decoding :
+    the Viterbi decoder is not invariant to a scaling of its LLRs (the ties between paths can be broken differently).
+
+    Args:
+        :flattened_mat: the flattened matrix (without the synchronisation symbols)
+        :pdcchu_lst:    the PDCCHU of the users
+        :soft:          if True, the convolutional code is decoded with soft decisions
+        :stats:         if not None, the instrumentation of the decoding (see `src.stats`)
+
+    Returns:
+        list[tuple]: for each user, (decoded bits, CRC status, error)
+    '''
+
+    results = [None] * len(pdcchu_lst)
+    decoded_lst = [None] * len(pdcchu_lst)
+
+    #---Groups
+    groups = {} # (mcs, length of the regions, or None for Hamming748) -> [(user index, region), ...]
+    for idx, pdcchu in enumerate(pdcchu_lst):
+        try:
+            entry = get_PDSCH_mcs(pdcchu['mcs'])
+        except NotImplementedError as err:
+            results[idx] = (None, False, str(err))
+            continue
+
+        region = get_region(flattened_mat, pdcchu['symb_start'], pdcchu['rb_start'], pdcchu['rb_size'])
+
+        if entry['code'] == 'hamming748':
+            try:
+                registry.hamming748().check_length(len(region) * entry['bits_per_symbol'])
+            except ValueError as err: # Same error as the one of `decode_array`, raised by the sequential decoding
+                results[idx] = (None, False, str(err))
+                continue
+
+        key = (pdcchu['mcs'], len(region) if entry['code'] == 'conv' else None)
+        groups.setdefault(key, []).append((idx, region))
+
+    #---Demodulation and decoding of each group
+    for (mcs, _), members in groups.items():
+        entry = get_PDSCH_mcs(mcs)
+        demod, bits_per_symbol = registry.demod(mcs)
+        indexes = [idx for idx, _ in members]
+        symbols = np.concatenate([region for _, region in members])
+
+        if stats is not None:
+            stats.count('symbols_demodulated', len(symbols))
+
+        if entry['code'] == 'conv':
+            with stage(stats, 'demod'):
+                if soft: # The noise variance is estimated for each user, as in `demod_decode_PDSCH_block`
+                    demoded = np.concatenate([llr_demod_array(region, bits_per_symbol) for _, region in members])
+                else:
+                    demoded = demod(symbols)
+
+            with stage(stats, 'fec'):
+                decoded = registry.viterbi().decode_batch(demoded.reshape(len(members), -1), 'soft' if soft else 'hard')
+
+            if stats is not None:
+                stats.count('viterbi_blocks_decoded', len(members))
+
+            for idx, bits in zip(indexes, decoded):
+                decoded_lst[idx] = bits.tolist()
+
+        else:
+            with stage(stats, 'demod'):
+                demoded = demod(symbols)
+
+            with stage(stats, 'fec'):
+                decoded, corrected, dropped = registry.hamming748().decode_array(demoded)
+
+            if stats is not None:
+                stats.count('codewords_decoded', len(corrected))
+                stats.count('hamming_corrected', corrected.sum())
+                stats.count('hamming_dropped', dropped.sum())
+
+            # Split back by offsets : each symbol gives bits_per_symbol / 2 decoded bits, and each codeword 4 decoded bits
+            offsets = np.cumsum([0] + [len(region) * bits_per_symbol // 2 for _, region in members])
+
+            for k, idx in enumerate(indexes):
+                if dropped[offsets[k] // 4 : offsets[k + 1] // 4].any():
+                    results[idx] = (None, False, 'Packet cannot be corrected, it has to be dropped.')
+                else:
+                    decoded_lst[idx] = decoded[offsets[k] : offsets[k + 1]].tolist()
+
+    #---CRC
+    for idx, pdcchu in enumerate(pdcchu_lst):
+        if results[idx] is not None:
+            continue
 
-    return toASCII(clear_msg)
+        with stage(stats, 'crc'):
+            crc_ok = registry.crc(pdcchu['crc_flag']).check(decoded_lst[idx])
+
+        if stats is not None:
+            stats.count('crc_checked')
+            stats.count('crc_failed', not crc_ok)
+
+        results[idx] = (decoded_lst[idx], crc_ok, None)
+
+    return results
 
 ##-DecodeMatrix
 class DecodeMatrix:
     '''Class defining methods to decode a simplified 5G signal'''
 
-    def __init__(self, matrix: list[list[np.complex128]]):
+    def __init__(self, matrix: np.ndarray | list[list[np.complex128]], soft: bool = True, stats: bool = False):
         '''
         Constructor.
 
         Args:
-            :matrix: the matrix representing the signal
+            :matrix: the matrix representing the signal, of shape (n_symbols, 624) (as returned by `get_matrix`)
+            :soft:   if True, the convolutional code of the PDSCH is decoded with soft decisions
+            :stats:  if True, the time spent in each stage and the counters are recorded (see `self.get_stats`)
         '''
 
-        self.matrix = matrix
+        self.matrix = np.asarray(matrix)
+        self.soft = soft
+        self.stats = Stats() if stats else None
         self.flattened_mat = None
 
         self.mat_idx = 0
 
-    def retrieve_PBCH(self) -> list[np.complex128]:
+        # PBCH decoded data, computed lazily (see `self._decode_PBCH_index`)
+        self.PBCH_header = None   # (cell_ident, user_nb)
+        self.PBCHU_lst = None     # [<PBCHU>, ...], in the PBCH order (None for the blocks that could not be decoded)
+        self.PBCHU_index = None   # {<user_ident>: <PBCHU>, ...}
+        self.PBCHU_errors = None  # [<error>, ...] for the blocks that could not be decoded
+
+        self.PDCCHU_index = {}    # {<user_ident>: <PDCCHU>, ...}, filled by `self.decode_PDCCHU_user`
+
+    def retrieve_PBCH(self) -> np.ndarray:
         '''
         Retrieves the PBCH (broadcast channel) from the matrix.
         It also flattens the matrix.
 
         In fact, it only removes the synchronisation symbols.
+        The flattened matrix is a view on the matrix (no copy), unless the matrix is not contiguous.
 
         Notes: We only know the beginning of it (third line, or more precisely, the first symbol that is not used for synchronisation).
         The lenght depends on the number of users.
@@ -137,34 +376,81 @@ class DecodeMatrix:
             np.ndarray: the PBCH we retrieved
         '''
 
-        pbch_and_more = self.matrix[2:] # The PBCH starts from the third line.
+        with stage(self.stats, 'flatten'):
+            self.flattened_mat = self.matrix[2:].reshape(-1) # The PBCH starts from the third line.
 
-        # Flatten the matrix
-        flatten_mat = []
-        for i in range(len(pbch_and_more)):
-            for j in range(len(pbch_and_more[i])):
-                flatten_mat.append(pbch_and_more[i][j])
+        return self.flattened_mat
 
-        self.flattened_mat = flatten_mat
-        return flatten_mat
+    def get_PBCH_block(self, block_idx: int) -> np.ndarray:
+        '''
+        Returns the 48 symbols block `block_idx` of the PBCH (0 for the header, k + 1 for the PBCHU of the k-th user).
+        The result is a view on the matrix (no copy).
+        '''
+
+        if self.flattened_mat is None:
+            self.retrieve_PBCH()
+
+        return self.flattened_mat[block_idx * 48 : (block_idx + 1) * 48]
 
     def decode_PBCH_header(self) -> tuple[int, int]:
         '''
         Decodes the header of the PBCH.
+        The result is kept, so the header is decoded only once.
 
         Returns:
             tuple: (cell ident, number of users).
         '''
-    
-        header = self.retrieve_PBCH()[:48]
 
-        decoded_header = demod_decode_block(header, 0) # 0 for 2qam
+        if self.PBCH_header is not None:
+            return self.PBCH_header
+
+        header = self.get_PBCH_block(0)
+
+        with stage(self.stats, 'pbch'):
+            decoded_header = demod_decode_block(header, 0, self.stats) # 0 for 2qam
 
         # Retreiving cell ident (18 bits) and user number (6 bits)
         cell_ident = bin2dec(decoded_header[:18])
         user_nb = bin2dec(decoded_header[18:])
 
-        return (cell_ident, user_nb)
+        self.PBCH_header = (cell_ident, user_nb)
+        self.cell_ident, self.user_nb = self.PBCH_header
+
+        return self.PBCH_header
+
+    def _decode_PBCH_index(self):
+        '''
+        Decodes the header and all the PBCHU blocks of the PBCH, and indexes the PBCHU by user ident.
+        This is done only once : the results are kept in `self.PBCHU_lst` and `self.PBCHU_index`.
+
+        A block that cannot be decoded is skipped (its error is kept in `self.PBCHU_errors`).
+        '''
+
+        if self.PBCHU_index is not None:
+            return
+
+        _, user_nb = self.decode_PBCH_header()
+
+        PBCHU_lst = []
+        PBCHU_index = {}
+        PBCHU_errors = []
+
+        for user_idx in range(user_nb):
+            try:
+                with stage(self.stats, 'pbch'):
+                    user_data = self.extract_PBCH_user_data(user_idx)
+
+            except ValueError as err:
+                PBCHU_lst.append(None)
+                PBCHU_errors.append(err)
+                continue
+
+            PBCHU_lst.append(user_data)
+            PBCHU_index.setdefault(user_data['user_ident'], user_data) # Keep the first occurence, as a sequential scan would
+
+        self.PBCHU_lst = PBCHU_lst
+        self.PBCHU_errors = PBCHU_errors
+        self.PBCHU_index = PBCHU_index
 
     def decode_PBCH(self) -> tuple[int, int, list[dict[str, int]]]:
         '''
@@ -176,21 +462,21 @@ class DecodeMatrix:
             tuple[int, int, list[dict]]: (cell_ident, user_nb, [{'user_ident': <user_ident>, 'mcs': <mcs>, 'symb_start': <symb_start>, 'rb_start': <rb_start>, 'harq': <harq>}, ...])
         '''
 
-        # Retreiving header data
-        self.cell_ident, self.user_nb = self.decode_PBCH_header()
+        self._decode_PBCH_index()
 
-        user_data = []
-        for user_idx in range(self.user_nb):
-            user_data.append(self.extract_PBCH_user_data(user_idx))
+        if self.PBCHU_errors != []:
+            raise self.PBCHU_errors[0]
 
-        return self.cell_ident, self.user_nb, user_data
+        return self.cell_ident, self.user_nb, [dict(user_data) for user_data in self.PBCHU_lst]
 
     def decode_PBCH_user(self, user_ident: int) -> dict[str, int]:
         '''
         Uses a method to retrieve the PBCH from the matrix,
         then demods (2qam) it and decodes it (Hamming748).
         Retrieves the cell ident and the number of users.
-        Then it parses all the matrix to find the user `user_ident`.
+        Then it finds the user `user_ident`.
+
+        The PBCH is decoded only once, on the first call : the next calls use the index built from it.
 
         Args:
             :user_ident: the user identifier.
@@ -199,13 +485,13 @@ class DecodeMatrix:
             dict[str, int]: {'user_ident': <user_ident>, 'mcs': <mcs>, 'symb_start': <symb_start>, 'rb_start': <rb_start>, 'harq': <harq>}
         '''
 
-        # Retreiving header data
-        self.cell_ident, self.user_nb = self.decode_PBCH_header()
+        self._decode_PBCH_index()
+
+        if user_ident in self.PBCHU_index:
+            return dict(self.PBCHU_index[user_ident])
 
-        for user_idx in range(self.user_nb):
-            if self.is_user_at_block(user_idx, user_ident):
-                extracted_data = self.extract_PBCH_user_data(user_idx)
-                return extracted_data
+        if self.PBCHU_errors != []: # The user may be in a block that could not be decoded
+            raise self.PBCHU_errors[0]
 
         raise ValueError(f'DecodeMatrix: decode_PBCH_user: user {user_ident} not found in the PBCH !')
 
@@ -220,11 +506,11 @@ class DecodeMatrix:
             dict[str, int]: {'user_ident': <user_ident>, 'mcs': <mcs>, 'symb_start': <symb_start>, 'rb_start': <rb_start>, 'harq': <harq>}
         '''
 
-        if self.flattened_mat == None:
+        if self.flattened_mat is None:
             raise ValueError('DecodeMatrix: extract_PBCH_user_data: self.flattened_mat not defined (run self.decode_PBCH first)')
     
         # Get the relevent part of the PBCH
-        pbchu_k = demod_decode_block(self.flattened_mat[(user_idx + 1) * 48 : (user_idx + 2) * 48])
+        pbchu_k = demod_decode_block(self.get_PBCH_block(user_idx + 1), 0, self.stats)
 
         ret = {}
         ret['user_ident'] = bin2dec(pbchu_k[:8]) # 8 bits for user ident
@@ -247,11 +533,11 @@ class DecodeMatrix:
             bool: PBCHU_k['user_ident'] == user_ident
         '''
 
-        if self.flattened_mat == None:
+        if self.flattened_mat is None:
             raise ValueError('DecodeMatrix: is_user_at_block: self.flattened_mat not defined (run self.decode_PBCH first)')
 
         # Get the relevent part of the PBCH
-        pbchu_k = demod_decode_block(self.flattened_mat[(user_idx + 1) * 48 : (user_idx + 2) * 48])
+        pbchu_k = demod_decode_block(self.get_PBCH_block(user_idx + 1))
 
         user_ident_from_mat = bin2dec(pbchu_k[:8]) # 8 bits for user ident
 
@@ -260,6 +546,7 @@ class DecodeMatrix:
     def decode_PDCCHU_user(self, user_ident: int) -> dict[str, int]:
         '''
         Retrieves the data from the PDCCHU concerning the user `user_ident` from the matrix using `self.decode_PBCH_user`.
+        The result is kept, so the PDCCHU of a user is decoded only once.
 
         Args:
             :user_ident: the identifier of the user to retrieve the data
@@ -268,19 +555,16 @@ class DecodeMatrix:
             dict[str, int]: {'user_ident': <user_ident>, 'mcs': <mcs>, 'symb_start': <symb_start>, 'rb_start': <rb_start>, 'crc_flag': <crc_flag>}
         '''
 
-        user_data = self.decode_PBCH_user(user_ident)
+        if user_ident in self.PDCCHU_index:
+            return dict(self.PDCCHU_index[user_ident])
 
-        beg_index = flatten_index(user_data['symb_start'] - 3, (user_data['rb_start'] - 1) * 12)
-
-        #TODO: this is an ugly fix. The number of resource blocks used for a PDCCHU section is hardcoded to 3 if mcs is 2, or 6 otherwise (mcs is 0).
-        if user_data['mcs'] == 2:
-            nb_of_rb = 3
-        else:
-            nb_of_rb = 6
+        user_data = self.decode_PBCH_user(user_ident)
 
-        modulated_data = self.flattened_mat[beg_index : beg_index + nb_of_rb * 12]
+        nb_of_rb = PDCCHU_nb_of_rb(user_data['mcs']) # 36 bits, coded (72 bits) and modulated : 6 resource blocks in bpsk, 3 in qpsk
+        modulated_data = get_region(self.flattened_mat, user_data['symb_start'], user_data['rb_start'], nb_of_rb)
 
-        decoded = demod_decode_block(modulated_data, user_data['mcs']) # 36 complex numbers -> 72 bits (4qam) -> 36 bits (Hamming748)
+        with stage(self.stats, 'pdcchu'):
+            decoded = demod_decode_block(modulated_data, user_data['mcs'], self.stats) # 36 complex numbers -> 72 bits (4qam) -> 36 bits (Hamming748)
 
         ret = {}
         ret['user_ident'] = bin2dec(decoded[:8]) # 8 bits
@@ -290,7 +574,26 @@ class DecodeMatrix:
         ret['rb_size'] = bin2dec(decoded[24:34]) # 10 bits
         ret['crc_flag'] = bin2dec(decoded[34:36]) # 2 bits
 
-        return ret
+        self.PDCCHU_index[user_ident] = ret
+
+        return dict(ret)
+
+    def decode_PDSCH_user(self, user_PDCCHU_data: dict[str, int]) -> tuple[list[int], bool]:
+        '''
+        Demods and decodes the PDSCH of a user, and checks its CRC.
+
+        Args:
+            :user_PDCCHU_data: the PDCCHU of the user (as returned by `self.decode_PDCCHU_user`)
+
+        Returns:
+            tuple[list[int], bool]: (decoded bits, True if the CRC is correct)
+        '''
+
+        if self.flattened_mat is None:
+            self.retrieve_PBCH()
+
+        with stage(self.stats, 'pdsch'):
+            return decode_PDSCH(self.flattened_mat, user_PDCCHU_data, self.soft, self.stats)
 
     def get_payload_user(self, user_ident: int) -> list[int]:
         '''
@@ -303,24 +606,134 @@ class DecodeMatrix:
         #-Get the data
         user_PDCCHU_data = self.decode_PDCCHU_user(user_ident)
 
-        beg_index = flatten_index(user_PDCCHU_data['symb_start'] - 3, (user_PDCCHU_data['rb_start'] - 1) * 12)
-        end_index = beg_index + 12 * user_PDCCHU_data['rb_size']
+        decoded, crc_ok = self.decode_PDSCH_user(user_PDCCHU_data)
+
+        if not crc_ok:
+            raise ValueError('DecodeMatrix: get_payload_user: error with CRC decoding (incorrect)')
 
-        # if end_index >= len(self.flattened_mat):
-        #     return
+        return decoded
 
-        modulated_data = self.flattened_mat[beg_index : end_index]
+    def decode_all(self, parallel: str | None = None, workers: int | None = None) -> list[dict]:
+        '''
+        Decodes the PBCHU, PDCCHU and PDSCH of every user of the PBCH.
+        The PBCH is decoded only once, and each PDCCHU and PDSCH is decoded only once.
 
-        decoded = demod_decode_PDSCH_block(modulated_data, user_PDCCHU_data['mcs'])
+        A user that cannot be decoded does not stop the decoding of the other ones : its error is kept in its result.
+        A payload with an incorrect CRC is returned, with `crc_ok` set to False.
 
-        #-Check the CRC
-        crc_size = 8 * (user_PDCCHU_data['crc_flag'] + 1)
-        poly = get_crc_poly(crc_size)
+        Once the PBCH and PDCCHU are known, the PDSCH of the users are independent, so they can be decoded in parallel :
+            - with `parallel='thread'`, in a thread pool sharing the flattened matrix ;
+            - with `parallel='process'`, in a process pool. The flattened matrix is copied once into a shared memory, read by all the workers ;
+            - with `parallel='batch'`, the users sharing an mcs are decoded together, in a few array operations (see `_decode_PDSCH_batch`).
 
-        if crc_decode(decoded, poly) == 0:
-            raise ValueError('DecodeMatrix: get_payload_user: error with CRC decoding (incorrect)')
+        Args:
+            :parallel: None (sequential), 'thread', 'process' or 'batch'
+            :workers:  the number of workers of the pool (default : the number of CPUs)
 
-        return decoded
+        Returns:
+            list[dict]: for each PBCHU block, in the PBCH order :
+                {
+                    'user_ident': <user_ident (None if the PBCHU block could not be decoded)>,
+                    'pbchu': <PBCHU>,
+                    'pdcchu': <PDCCHU>,
+                    'payload': <decoded bits>,
+                    'crc_ok': <True if the CRC is correct>,
+                    'text': <payload converted to a string>,
+                    'error': <error message, or None>
+                }
+        '''
+
+        if parallel not in (None, 'thread', 'process', 'batch'):
+            raise ValueError(f'DecodeMatrix: decode_all: unknown parallel mode "{parallel}"')
+
+        self._decode_PBCH_index()
+
+        errors = iter(self.PBCHU_errors)
+
+        #---PBCHU and PDCCHU
+        results = []
+        to_decode = [] # Results that need their PDSCH to be decoded
+        for pbchu in self.PBCHU_lst:
+            res = {'user_ident': None, 'pbchu': None, 'pdcchu': None, 'payload': None, 'crc_ok': False, 'text': None, 'error': None}
+            results.append(res)
+
+            if pbchu is None:
+                res['error'] = str(next(errors))
+                continue
+
+            res['user_ident'] = pbchu['user_ident']
+            res['pbchu'] = dict(pbchu)
+
+            try:
+                res['pdcchu'] = self.decode_PDCCHU_user(pbchu['user_ident'])
+            except (ValueError, NotImplementedError) as err: # NotImplementedError for an unsupported mcs
+                res['error'] = str(err)
+                continue
+
+            to_decode.append(res)
+
+        #---PDSCH
+        pdcchu_lst = [res['pdcchu'] for res in to_decode]
+
+        if parallel is None or len(to_decode) <= 1:
+            decoded_lst = [_decode_PDSCH_no_raise(self.flattened_mat, pdcchu, self.soft, self.stats) for pdcchu in pdcchu_lst]
+
+        elif parallel == 'batch':
+            with stage(self.stats, 'pdsch'):
+                decoded_lst = _decode_PDSCH_batch(self.flattened_mat, pdcchu_lst, self.soft, self.stats)
+
+        elif parallel == 'thread':
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                decoded_lst = list(executor.map(lambda pdcchu: _decode_PDSCH_no_raise(self.flattened_mat, pdcchu, self.soft, self.stats), pdcchu_lst))
+
+        else:
+            flattened_mat = np.ascontiguousarray(self.flattened_mat)
+            shm = SharedMemory(create=True, size=max(flattened_mat.nbytes, 1))
+
+            try:
+                shared_mat = np.ndarray(flattened_mat.shape, dtype=flattened_mat.dtype, buffer=shm.buf)
+                shared_mat[:] = flattened_mat
+                del shared_mat
+
+                n = len(pdcchu_lst)
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    decoded_lst = list(executor.map(
+                        _decode_PDSCH_shared,
+                        [shm.name] * n, [flattened_mat.shape] * n, [flattened_mat.dtype.str] * n, pdcchu_lst, [self.soft] * n, [self.stats is not None] * n
+                    ))
+
+                for *_, worker_stats in decoded_lst:
+                    if worker_stats is not None:
+                        self.stats.merge(worker_stats)
+
+                decoded_lst = [ret[:3] for ret in decoded_lst]
+
+            finally:
+                shm.close()
+                shm.unlink()
+
+        for res, (payload, crc_ok, error) in zip(to_decode, decoded_lst):
+            if error is not None:
+                res['error'] = error
+                continue
+
+            res['payload'], res['crc_ok'] = payload, crc_ok
+            res['text'] = payload_to_str(payload, res['user_ident'])
+
+        return results
+
+    def get_stats(self) -> dict[str, dict] | None:
+        '''
+        Returns the time spent in each stage of the decoding so far, and the counters (see `src.stats`).
+
+        Returns:
+            dict | None: {'times': {<stage>: <seconds>, ...}, 'counters': {<counter>: <value>, ...}}, or None if the stats are not enabled
+        '''
+
+        if self.stats is None:
+            return None
+
+        return self.stats.as_dict()
 
 
 ##-Tests
@@ -375,3 +788,18 @@ def test_decode_all_payloads(matrix):
         except ValueError as err:
             print(f'    User #{user_ident}: error: {err}')
 
+
+def test_decode_views(matrix):
+    '''Tests that the flattened matrix and the regions are views on the matrix.'''
+
+    d = DecodeMatrix(np.ascontiguousarray(matrix))
+    d.decode_PBCH_header()
+
+    assert np.shares_memory(d.flattened_mat, d.matrix)
+    assert np.shares_memory(d.get_PBCH_block(1), d.matrix)
+
+    pdcchu = d.decode_PDCCHU_user(d.decode_PBCH()[2][0]['user_ident'])
+    region = get_region(d.flattened_mat, pdcchu['symb_start'], pdcchu['rb_start'], pdcchu['rb_size'])
+
+    assert np.shares_memory(region, d.matrix)
+    assert len(region) == 12 * pdcchu['rb_size']
@@ -1,6 +1,70 @@
 import numpy as np
 import math
 
+##-Vectorized demodulation
+def bpsk_demod_array(v: np.ndarray | list[np.complex128]) -> np.ndarray:
+    """
+    BPSK demodulation (2 QAM) of a whole array.
+    The returned array is of the same length than the input one.
+
+    Args:
+        v (np.ndarray): input sequence.
+
+    Returns:
+        np.ndarray: calculated demodulation (uint8 bits).
+    """
+
+    v = np.asarray(v).reshape(-1)
+
+    return (v.real > 0).astype(np.uint8)
+
+def qpsk_demod_array(v: np.ndarray | list[np.complex128]) -> np.ndarray:
+    """
+    QPSK demodulation of a whole array.
+    The length of the returned array is the twice the length of the input one.
+
+    Args:
+        v (np.ndarray): input sequence.
+
+    Returns:
+        np.ndarray: calculated demodulation (uint8 bits), interleaved as (real bit, imaginary bit) for each symbol.
+    """
+
+    v = np.asarray(v).reshape(-1)
+
+    bits = np.empty((len(v), 2), dtype=np.uint8)
+    bits[:, 0] = v.real > 0
+    bits[:, 1] = v.imag > 0
+
+    return bits.reshape(-1)
+
+def qam16_demod_array(v: np.ndarray | list[np.complex128]) -> np.ndarray:
+    """
+    qam16 demodulation of a whole array.
+    The length of the returned array is four times the length of the input one.
+
+    Args:
+        v (np.ndarray): input sequence.
+
+    Returns:
+        np.ndarray: calculated demodulation (uint8 bits), interleaved as (bit1, bit2, bit3, bit4) for each symbol.
+    """
+
+    # %FIXME Scaling vector
+    v = np.asarray(v).reshape(-1) * math.sqrt(2/3*(16-1))
+
+    re = v.real
+    im = v.imag
+
+    bits = np.empty((len(v), 4), dtype=np.uint8)
+    bits[:, 0] = re < 0                   # bit1: sign of the real part
+    bits[:, 1] = im < 0                   # bit2: sign of the imaginary part
+    bits[:, 2] = (re >= -2) & (re < 2)    # bit3: inner columns
+    bits[:, 3] = (im >= -2) & (im < 2)    # bit4: inner rows
+
+    return bits.reshape(-1)
+
+##-Demodulation
 def bpsk_demod(v: np.ndarray | list[np.complex128]) -> list[int]:
     """
     BPSK demodulation (2 QAM).
@@ -13,15 +77,7 @@ def bpsk_demod(v: np.ndarray | list[np.complex128]) -> list[int]:
         list[int]: calculated demodulation.
     """
 
-    ret = []
-    
-    for c in v:
-        if c.real <= 0:
-            ret.append(0)
-        else:
-            ret.append(1)
-
-    return ret
+    return bpsk_demod_array(v).tolist()
 
 def qpsk_demod(v: np.ndarray | list[np.complex128]) -> list[int]:
     """
@@ -35,20 +91,7 @@ def qpsk_demod(v: np.ndarray | list[np.complex128]) -> list[int]:
         list[int]: calculated demodulation.
     """
 
-    ret = []
-
-    for c in v:
-        if c.real <= 0:
-            ret.append(0)
-        else:
-            ret.append(1)
-
-        if c.imag <= 0:
-            ret.append(0)
-        else:
-            ret.append(1)
-
-    return ret
+    return qpsk_demod_array(v).tolist()
 
 def qam16_demod(v: np.ndarray | list[np.complex128]) -> list[int]:
     """qam16 demodulation.
@@ -60,46 +103,109 @@ def qam16_demod(v: np.ndarray | list[np.complex128]) -> list[int]:
         list[int]: calculated demodulation.
     """
 
-    if type(v) == list:
-        v = np.array(v)
-
-    # %FIXME Scaling vector 
-    v = v * math.sqrt(2/3*(16-1))
-    # Need to switch to vector 
-    v = np.matrix.flatten(v)
-    # Instantiate an empty list
-    output_sequence = []
-    # Decoding each element 
-    for elem in v:
-        # --- Real part decision 
-        if np.real(elem) < -  2:
-            bit1 = 1
-            bit3 = 0
-        elif  np.real(elem) < 0:
-            bit1 = 1
-            bit3 = 1
-        elif  np.real(elem) < 2:
-            bit1 = 0
-            bit3 = 1
-        else:
-            bit1 = 0
-            bit3 = 0
-
-        # Imag part 
-        if np.imag(elem) < -2:
-            bit2 = 1
-            bit4 = 0
-        elif  np.imag(elem) < 0:
-            bit2 = 1
-            bit4 = 1
-        elif  np.imag(elem) < 2:
-            bit2 = 0
-            bit4 = 1
-        else:
-            bit2 = 0
-            bit4 = 0
-        output_sequence.append(bit1)
-        output_sequence.append(bit2)
-        output_sequence.append(bit3)
-        output_sequence.append(bit4)
-    return output_sequence
+    return qam16_demod_array(v).tolist()
+
+##-Soft demodulation (LLR)
+def _constellation(bits_per_symbol: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the constellation used by the hard demodulators above, with the bits of each point.
+
+    Args:
+        bits_per_symbol (int): 1 for bpsk, 2 for qpsk, 4 for qam16.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (points, of shape (M,), bits of each point, of shape (M, bits_per_symbol)).
+    """
+
+    labels = np.array([[(m >> (bits_per_symbol - 1 - k)) & 1 for k in range(bits_per_symbol)] for m in range(2**bits_per_symbol)])
+
+    if bits_per_symbol == 1:
+        points = np.where(labels[:, 0] == 1, 1, -1) + 0j
+
+    elif bits_per_symbol == 2:
+        points = (np.where(labels[:, 0] == 1, 1, -1) + 1j * np.where(labels[:, 1] == 1, 1, -1)) / math.sqrt(2)
+
+    elif bits_per_symbol == 4:
+        # On each axis, (sign bit, inner bit): -3 -> (1, 0), -1 -> (1, 1), 1 -> (0, 1), 3 -> (0, 0)
+        level = lambda sign_bit, inner_bit: (1 - 2 * sign_bit) * (3 - 2 * inner_bit)
+        points = (level(labels[:, 0], labels[:, 2]) + 1j * level(labels[:, 1], labels[:, 3])) / math.sqrt(2/3*(16-1))
+
+    else:
+        raise ValueError(f'bits_per_symbol should be 1, 2 or 4, but {bits_per_symbol} was found !')
+
+    return points, labels
+
+CONSTELLATIONS = {bps: _constellation(bps) for bps in (1, 2, 4)}
+
+##-Modulation
+def modulate_array(bits: np.ndarray | list[int], bits_per_symbol: int) -> np.ndarray:
+    """
+    Modulation (bpsk, qpsk or qam16) of a whole array, with the constellations of the demodulators (inverse of the hard demodulators).
+
+    Args:
+        bits (np.ndarray): the bits to modulate. Its length should be a multiple of `bits_per_symbol`.
+        bits_per_symbol (int): 1 for bpsk, 2 for qpsk, 4 for qam16.
+
+    Returns:
+        np.ndarray: the complex symbols.
+    """
+
+    bits = np.asarray(bits, dtype=np.uint8).reshape(-1)
+    points, _ = CONSTELLATIONS[bits_per_symbol]
+
+    if len(bits) % bits_per_symbol != 0:
+        raise ValueError(f'the number of bits should be a multiple of {bits_per_symbol}, but {len(bits)} was found !')
+
+    weights = 1 << np.arange(bits_per_symbol - 1, -1, -1) # The first bit of a symbol is the most significant one of its label
+
+    return points[bits.reshape(-1, bits_per_symbol) @ weights]
+
+def llr_demod_array(v: np.ndarray | list[np.complex128], bits_per_symbol: int, noise_var: float | None = None) -> np.ndarray:
+    """
+    Soft demodulation : computes the log-likelihood ratio of each bit (max-log approximation).
+
+    The LLR of a bit is log(P(bit = 1) / P(bit = 0)) : it is positive when the bit is more likely a 1,
+    so its sign gives the same decision as the hard demodulators.
+
+    Args:
+        v (np.ndarray): input sequence.
+        bits_per_symbol (int): 1 for bpsk, 2 for qpsk, 4 for qam16.
+        noise_var (float, optional): variance of the complex noise. If None, it is estimated from the distance of the symbols to the closest constellation points.
+
+    Returns:
+        np.ndarray: the LLR of each bit (float), in the same order as the bits returned by the hard demodulators.
+    """
+
+    v = np.asarray(v).reshape(-1)
+    points, labels = CONSTELLATIONS[bits_per_symbol]
+
+    dist = np.abs(v[:, None] - points[None, :]) ** 2 # (n, M)
+
+    if noise_var is None:
+        noise_var = np.mean(dist.min(axis=1)) if len(v) > 0 else 1.0
+
+    noise_var = max(noise_var, 1e-12)
+
+    llr = np.empty((len(v), bits_per_symbol))
+    for k in range(bits_per_symbol):
+        d0 = dist[:, labels[:, k] == 0].min(axis=1)
+        d1 = dist[:, labels[:, k] == 1].min(axis=1)
+
+        llr[:, k] = (d0 - d1) / noise_var
+
+    return llr.reshape(-1)
+
+def bpsk_llr(v: np.ndarray | list[np.complex128], noise_var: float | None = None) -> np.ndarray:
+    """BPSK soft demodulation (see `llr_demod_array`)."""
+
+    return llr_demod_array(v, 1, noise_var)
+
+def qpsk_llr(v: np.ndarray | list[np.complex128], noise_var: float | None = None) -> np.ndarray:
+    """QPSK soft demodulation (see `llr_demod_array`)."""
+
+    return llr_demod_array(v, 2, noise_var)
+
+def qam16_llr(v: np.ndarray | list[np.complex128], noise_var: float | None = None) -> np.ndarray:
+    """qam16 soft demodulation (see `llr_demod_array`)."""
+
+    return llr_demod_array(v, 4, noise_var)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+File defining a transmitter : it builds T/F matrices in the layout expected by `DecodeMatrix` (as returned by `get_matrix`).
+
+Layout of a matrix (a slot), after the two synchronisation symbols :
+    - the PBCH : the header (cell ident and number of users), followed by one PBCHU block per user (BPSK, Hamming748) ;
+    - for each user, its PDCCHU (BPSK or QPSK, Hamming748), followed by its PDSCH (modulation and code given by its mcs).
+Each PDCCHU and PDSCH starts on a resource block (12 subcarriers) boundary.
+
+It is used to test and benchmark the decoder with as many users, payloads and slots as needed.
+'''
+
+##-Imports
+import numpy as np
+
+from src.binary_transformation import byteToBitArray, cesarEncodeArray
+from src.crc import crc_encode
+from src.demod import modulate_array
+from src.mcs import RB_SIZE, PDCCHU_nb_of_rb, get_PDCCHU_mcs, get_PDSCH_mcs
+from src.registry import registry
+from src.utils import N_RE, dec2bin, sync_symbols, unflatten_index
+from src.viterbi import DEPTH, conv_encode
+
+##-Constants
+N_SYMB = 14          # Number of OFDM symbols of a slot
+PBCH_BLOCK_SIZE = 48 # Number of symbols of the PBCH header and of each PBCHU block
+
+MAX_USERS = 2**6 - 1 # The number of users is written on 6 bits
+MAX_SYMB_START = 2**4 - 1
+MAX_RB_SIZE = 2**10 - 1
+
+##-Encoders
+def encode_block(bits: list[int] | np.ndarray, mcs: int = 0) -> np.ndarray:
+    '''
+    Encodes (using Hamming748) and modulates (using 2QAM or 4QAM according to `mcs`) a block (inverse of `demod_decode_block`).
+
+    Args:
+        :bits: the bits to encode. Their number should be a multiple of 4.
+        :mcs:  0 for bpsk, 2 for qpsk
+
+    Returns:
+        np.ndarray: the complex symbols
+    '''
+
+    return modulate_array(registry.hamming748().encode(bits), get_PDCCHU_mcs(mcs)['bits_per_symbol'])
+
+def encode_PDSCH_block(bits: list[int] | np.ndarray, mcs: int) -> np.ndarray:
+    '''
+    Encodes and modulates a PDSCH block according to the `mcs` (inverse of `demod_decode_PDSCH_block`).
+
+    For the convolutional code, DEPTH - 1 zero bits are appended to `bits` before the encoding :
+    the decoder does not output its last DEPTH - 1 bits.
+
+    Args:
+        :bits: the bits to encode (data followed by its CRC)
+        :mcs:  the mcs (see `demod_decode_PDSCH_block`). Only the codes 1 (1/2 convolutional) and 5 (Hamming748) are implemented.
+
+    Returns:
+        np.ndarray: the complex symbols
+    '''
+
+    entry = get_PDSCH_mcs(mcs)
+    bits = np.asarray(bits, dtype=np.uint8).reshape(-1)
+
+    if entry['code'] == 'conv':
+        encoded = conv_encode(np.concatenate((bits, np.zeros(DEPTH - 1, dtype=np.uint8))))
+    else:
+        encoded = registry.hamming748().encode(bits)
+
+    return modulate_array(encoded, entry['bits_per_symbol'])
+
+def PDSCH_capacity(mcs: int, rb_size: int) -> int:
+    '''
+    Returns the number of bits (data and CRC) carried by a PDSCH of `rb_size` resource blocks, i.e the length of the decoded PDSCH.
+
+    Args:
+        :mcs:     the mcs of the PDSCH
+        :rb_size: the number of resource blocks of the PDSCH
+    '''
+
+    entry = get_PDSCH_mcs(mcs)
+    n_coded = RB_SIZE * rb_size * entry['bits_per_symbol']
+
+    if entry['code'] == 'conv':
+        return round(n_coded * entry['rate']) - (DEPTH - 1)
+
+    return round(n_coded * entry['rate'])
+
+def PDSCH_rb_size(mcs: int, n_bits: int) -> int:
+    '''
+    Returns the smallest number of resource blocks of a PDSCH carrying at least `n_bits` bits (data and CRC).
+
+    Args:
+        :mcs:    the mcs of the PDSCH
+        :n_bits: the number of bits to carry
+    '''
+
+    rb_size = 1
+    while PDSCH_capacity(mcs, rb_size) < n_bits or (get_PDSCH_mcs(mcs)['code'] == 'hamming748' and PDSCH_capacity(mcs, rb_size) % 4 != 0):
+        rb_size += 1
+
+    return rb_size
+
+def encode_payload(payload: bytes | str, user_ident: int, mcs: int, crc_flag: int) -> tuple[np.ndarray, int]:
+    '''
+    Builds the bits of a PDSCH : the payload encrypted with the Cesar key of the user (see `payload_to_str`),
+    padded (with encrypted null bytes) to fill the PDSCH, and followed by its CRC.
+
+    Args:
+        :payload:    the message (a str is encoded in latin-1)
+        :user_ident: the user identifier
+        :mcs:        the mcs of the PDSCH
+        :crc_flag:   the CRC flag (the size of the CRC is 8 * (crc_flag + 1))
+
+    Returns:
+        tuple[np.ndarray, int]: (bits, number of resource blocks of the PDSCH)
+    '''
+
+    if isinstance(payload, str):
+        payload = payload.encode('latin-1')
+
+    crc_size = 8 * (crc_flag + 1)
+
+    rb_size = PDSCH_rb_size(mcs, 8 * len(payload) + crc_size)
+    n_data = PDSCH_capacity(mcs, rb_size) - crc_size
+
+    padded = np.zeros(-(-n_data // 8), dtype=np.uint8)
+    padded[:len(payload)] = np.frombuffer(payload, dtype=np.uint8)
+
+    data = byteToBitArray(cesarEncodeArray(user_ident, padded))[:n_data]
+
+    return crc_encode(data, crc_size), rb_size
+
+##-Matrix
+def _region_start(cursor: int) -> tuple[int, int]:
+    '''Returns the (symb_start, rb_start) of a region beginning at the index `cursor` of the flattened matrix.'''
+
+    row, col = unflatten_index(cursor)
+
+    return row + 3, col // RB_SIZE + 1 # The flattened matrix starts at the third symbol, and the indexes start at 1
+
+def build_matrix(cell_ident: int, users: list[dict], n_symbols: int = N_SYMB, noise_var: float = 0.0, rng: np.random.Generator | None = None) -> np.ndarray:
+    '''
+    Builds the matrix of a slot.
+
+    Args:
+        :cell_ident: the cell identifier (18 bits)
+        :users:      the users, in the PBCH order :
+                        [{'user_ident': <user_ident>, 'mcs': <mcs of the PDSCH>, 'crc_flag': <crc_flag>, 'payload': <bytes or str>, 'pdcchu_mcs': <0 or 2 (optional, default 2)>}, ...]
+        :n_symbols:  the number of OFDM symbols of the matrix
+        :noise_var:  the variance of the complex additive white gaussian noise (0 for no noise)
+        :rng:        the random generator used for the noise
+
+    Returns:
+        np.ndarray: the matrix, of shape (n_symbols, 624)
+    '''
+
+    if len(users) > MAX_USERS:
+        raise ValueError(f'build_matrix: at most {MAX_USERS} users can be written in the PBCH, but {len(users)} were given')
+
+    n_data = (n_symbols - 2) * N_RE
+    flat = np.zeros(n_data, dtype=np.complex128)
+
+    def put(cursor: int, symbols: np.ndarray):
+        if cursor + len(symbols) > n_data:
+            raise ValueError(f'build_matrix: the users do not fit in {n_symbols} symbols')
+
+        flat[cursor : cursor + len(symbols)] = symbols
+
+    #---PBCH header
+    put(0, encode_block(dec2bin(cell_ident, 18) + dec2bin(len(users), 6)))
+
+    cursor = -(-PBCH_BLOCK_SIZE * (len(users) + 1) // RB_SIZE) * RB_SIZE # The first PDCCHU starts after the PBCH, on a resource block boundary
+
+    for user_idx, user in enumerate(users):
+        pdcchu_mcs = user.get('pdcchu_mcs', 2)
+
+        #---PDCCHU
+        pdcchu_start = cursor
+        pdcchu_symb_start, pdcchu_rb_start = _region_start(pdcchu_start)
+        cursor += RB_SIZE * PDCCHU_nb_of_rb(pdcchu_mcs)
+
+        #---PDSCH
+        bits, rb_size = encode_payload(user['payload'], user['user_ident'], user['mcs'], user['crc_flag'])
+        symb_start, rb_start = _region_start(cursor)
+
+        if max(pdcchu_symb_start, symb_start) > MAX_SYMB_START or rb_size > MAX_RB_SIZE:
+            raise ValueError(f'build_matrix: the user {user["user_ident"]} cannot be addressed (symb_start {symb_start}, rb_size {rb_size})')
+
+        put(cursor, encode_PDSCH_block(bits, user['mcs']))
+        cursor += RB_SIZE * rb_size
+
+        #---PBCHU and PDCCHU content
+        pbchu = dec2bin(user['user_ident'], 8) + dec2bin(pdcchu_mcs, 2) + dec2bin(pdcchu_symb_start, 4) + dec2bin(pdcchu_rb_start, 6) + dec2bin(0, 4) # The harq is 0
+        put((user_idx + 1) * PBCH_BLOCK_SIZE, encode_block(pbchu))
+
+        pdcchu = dec2bin(user['user_ident'], 8) + dec2bin(user['mcs'], 6) + dec2bin(symb_start, 4) + dec2bin(rb_start, 6) + dec2bin(rb_size, 10) + dec2bin(user['crc_flag'], 2)
+        put(pdcchu_start, encode_block(pdcchu, pdcchu_mcs))
+
+    matrix = np.concatenate((sync_symbols(), flat.reshape(n_symbols - 2, N_RE)))
+
+    #---Noise
+    if noise_var > 0:
+        if rng is None:
+            rng = np.random.default_rng()
+
+        matrix = matrix + np.sqrt(noise_var / 2) * (rng.standard_normal(matrix.shape) + 1j * rng.standard_normal(matrix.shape))
+
+    return matrix
+
+def build_capture(slots: list[tuple[int, list[dict]]], noise_var: float = 0.0, rng: np.random.Generator | None = None) -> np.ndarray:
+    '''
+    Builds a capture made of several slots of N_SYMB symbols (see `build_matrix`), as read by the streaming decoder.
+
+    Args:
+        :slots:     [(cell_ident, users), ...]
+        :noise_var: the variance of the complex additive white gaussian noise (0 for no noise)
+        :rng:       the random generator used for the noise
+
+    Returns:
+        np.ndarray: the capture, of shape (N_SYMB * len(slots), 624)
+    '''
+
+    if rng is None and noise_var > 0:
+        rng = np.random.default_rng()
+
+    return np.concatenate([build_matrix(cell_ident, users, N_SYMB, noise_var, rng) for cell_ident, users in slots])
+
+def random_users(n_users: int, payload_size: int = 4, mcs: tuple[int] = (7,), crc_flags: tuple[int] = (0,), rng: np.random.Generator | None = None) -> list[dict]:
+    '''
+    Generates users with random payloads (printable ASCII), to be given to `build_matrix`.
+    With the default values, MAX_USERS users fit in a slot.
+
+    Args:
+        :n_users:      the number of users (their identifiers are 1 to n_users)
+        :payload_size: the number of bytes of each payload
+        :mcs:          the mcs of the PDSCH are drawn from these values
+        :crc_flags:    the CRC flags are drawn from these values
+        :rng:          the random generator
+
+    Returns:
+        list[dict]: the users
+    '''
+
+    if rng is None:
+        rng = np.random.default_rng()
+
+    return [
+        {
+            'user_ident': user_ident,
+            'mcs': int(rng.choice(mcs)),
+            'crc_flag': int(rng.choice(crc_flags)),
+            'payload': rng.integers(0x20, 0x7F, payload_size, dtype=np.uint8).tobytes(),
+        }
+        for user_ident in range(1, n_users + 1)
+    ]
@@ -20,14 +20,27 @@ class Hamming748:
         ]
         self.H = np.array(self.H_)
 
-    def encode(self, x: list[int]) -> list[int]:
-        '''TODO: Docstring for encode.ERROR main.py::test_error
-        - x : TODO
+    def encode(self, x: list[int] | np.ndarray) -> list[int]:
         '''
-    
-        pass
+        Encodes `x`, using a lookup table.
+
+        - x : the bits to encode. Its length should be a multiple of four.
 
-    def decode(self, y: list[int]) -> list[int]:
+        Returns:
+            The encoded bits (the four bits of each word, followed by three parity bits and the global parity bit).
+            The length of the output is twice the length of the input.
+        '''
+
+        x = np.asarray(x, dtype=np.uint8).reshape(-1)
+
+        if len(x) % 4 != 0:
+            raise ValueError('The length of `x` must be a multiple of 4')
+
+        words = np.packbits(x.reshape(-1, 4), axis=1)[:, 0] >> 4 # x[0] is the most significant bit
+
+        return ENCODE_TABLE[words].reshape(-1).tolist()
+
+    def decode(self, y: list[int] | np.ndarray) -> list[int]:
         '''
         Decodes `y`.
 
@@ -37,16 +50,49 @@ class Hamming748:
             The decoded bits. The length of the output is the half of the length of the input.
         '''
 
-        if len(y) % 8 != 0:
-            raise ValueError('The length of `y` must be a multiple of 8')
-    
-        res = []
-        for k in range(len(y) // 8):
-            y_ = y[k * 8 : (k + 1) * 8]
+        x, _, dropped = self.decode_array(y)
+
+        if dropped.any():
+            raise ValueError('Packet cannot be corrected, it has to be dropped.')
+
+        return x.tolist()
+
+    def decode_array(self, y: list[int] | np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        '''
+        Decodes all the codewords of `y` at once, using a lookup table.
+
+        Each 8 bits codeword is packed into a byte, which indexes a precomputed table
+        giving the four decoded bits and the error status of the codeword.
+        It does not raise an error for the codewords that cannot be corrected : they are flagged instead.
+
+        - y : the bits to decode. Its length should be a multiple of eight.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: (decoded bits (uint8), corrected flags, dropped flags).
+            There is one flag per codeword. The decoded bits of a dropped codeword are its first four bits, uncorrected.
+        '''
+
+        y = np.asarray(y, dtype=np.uint8)
+        self.check_length(len(y))
+
+        codewords = np.packbits(y.reshape(-1, 8), axis=1)[:, 0] # y[0] is the most significant bit
+
+        x = DECODE_TABLE[codewords]
+        status = STATUS_TABLE[codewords]
 
-            res += self.decode_block(y_)
+        return x.reshape(-1), status == CORRECTED, status == DROPPED
 
-        return res
+    def check_length(self, n_bits: int):
+        '''
+        Checks that `n_bits` bits can be decoded, i.e that they are made of whole codewords.
+
+        - n_bits : the number of bits to decode.
+
+        Raises a ValueError if `n_bits` is not a multiple of eight.
+        '''
+
+        if n_bits % 8 != 0:
+            raise ValueError('The length of `y` must be a multiple of 8')
 
     def decode_block(self, y: list[int]) -> list[int]:
         '''
@@ -118,3 +164,60 @@ class Hamming748:
         return 1, c
 
 
+
+##-Lookup tables
+# Error status of a codeword
+OK = 0
+CORRECTED = 1
+DROPPED = 2
+
+def _build_tables() -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Builds the decoding lookup tables, by decoding all the 256 possible codewords with `Hamming748.decode_block`.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (decoded bits, of shape (256, 4), error status, of shape (256,))
+    '''
+
+    h = Hamming748()
+
+    decode_table = np.zeros((256, 4), dtype=np.uint8)
+    status_table = np.zeros(256, dtype=np.uint8)
+
+    for c in range(256):
+        y = [(c >> (7 - k)) & 1 for k in range(8)]
+
+        nb_err, _ = h._calc_err(y)
+
+        if nb_err >= 2:
+            decode_table[c] = y[:4]
+            status_table[c] = DROPPED
+
+        else:
+            decode_table[c] = h.decode_block(y)
+            status_table[c] = CORRECTED if nb_err == 1 else OK
+
+    return decode_table, status_table
+
+DECODE_TABLE, STATUS_TABLE = _build_tables()
+
+def _build_encode_table() -> np.ndarray:
+    '''
+    Builds the encoding lookup table, from the decoding tables : the codeword of a word is the valid codeword (null syndrome and correct parity bit) decoded into it.
+
+    Returns:
+        np.ndarray: the codewords of the 16 words, of shape (16, 8)
+    '''
+
+    encode_table = np.zeros((16, 8), dtype=np.uint8)
+
+    for c in np.flatnonzero(STATUS_TABLE == OK):
+        if bin(c).count('1') % 2 != 0: # The parity bit is not checked when the syndrome is null
+            continue
+
+        word = int(''.join(str(k) for k in DECODE_TABLE[c]), 2)
+        encode_table[word] = [(c >> (7 - k)) & 1 for k in range(8)]
+
+    return encode_table
+
+ENCODE_TABLE = _build_encode_table()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+File defining the MCS (modulation and coding scheme) tables.
+
+Each implemented mcs is mapped to its modulation (demodulation function and number of bits per symbol) and to its code (FEC decoder and code rate).
+The decoder dispatches on these tables, and the block lengths (e.g the number of resource blocks of a PDCCHU) are derived from them.
+
+The mcs of a PDCCHU (given by the PBCHU) is:
+    0 : bpsk, Hamming748
+    1 : not implemented in this project
+    2 : qpsk, Hamming748
+    3 : not implemented in this project
+
+The mcs of a PDSCH (given by the PDCCHU) is:
+    mcs % 5  : 0 for bpsk, 1 for qpsk, 2 for 16qam (3 for 64qam and 4 for 256qam are not implemented) ;
+    mcs // 5 : 1 for the 1/2 convolutional code, 5 for 1/2 Hamming748 (the other codes are not implemented).
+'''
+
+##-Imports
+from src.demod import bpsk_demod_array, qpsk_demod_array, qam16_demod_array
+
+##-Constants
+RB_SIZE = 12     # Number of subcarriers of a resource block
+PDCCHU_BITS = 36 # Number of bits of a PDCCHU, before coding
+
+# Name -> (hard demodulation function, number of bits per symbol)
+MODULATIONS = {
+    'bpsk': (bpsk_demod_array, 1),
+    'qpsk': (qpsk_demod_array, 2),
+    '16qam': (qam16_demod_array, 4),
+}
+
+# Name -> code rate
+CODES = {
+    'conv': 1/2,       # Convolutional code (1011011, 1111001), decoded by `ViterbiDecoder`
+    'hamming748': 1/2, # Decoded by `Hamming748`
+}
+
+##-Tables
+def _mcs_entry(mcs: int, modulation: str, code: str) -> dict:
+    '''Builds the entry of an mcs in the tables.'''
+
+    demod, bits_per_symbol = MODULATIONS[modulation]
+
+    return {
+        'mcs': mcs,
+        'modulation': modulation,
+        'demod': demod,
+        'bits_per_symbol': bits_per_symbol,
+        'code': code,
+        'rate': CODES[code],
+    }
+
+PDCCHU_MCS_TABLE = {
+    0: _mcs_entry(0, 'bpsk', 'hamming748'),
+    2: _mcs_entry(2, 'qpsk', 'hamming748'),
+}
+
+PDSCH_MCS_TABLE = {
+    5 * code_idx + modulation_idx: _mcs_entry(5 * code_idx + modulation_idx, modulation, code)
+    for code_idx, code in ((1, 'conv'), (5, 'hamming748'))
+    for modulation_idx, modulation in enumerate(('bpsk', 'qpsk', '16qam'))
+}
+
+##-Functions
+def get_PDCCHU_mcs(mcs: int) -> dict:
+    '''
+    Returns the entry of the mcs of a PDCCHU.
+
+    Args:
+        :mcs: the mcs, from the PBCHU (2 bits)
+
+    Returns:
+        dict: {'mcs': <mcs>, 'modulation': <name>, 'demod': <function>, 'bits_per_symbol': <bits_per_symbol>, 'code': <name>, 'rate': <rate>}
+    '''
+
+    if mcs in PDCCHU_MCS_TABLE:
+        return PDCCHU_MCS_TABLE[mcs]
+
+    if mcs in (1, 3):
+        raise NotImplementedError('Not implemented in this project')
+
+    raise ValueError(f'mcs should be in [0 ; 3], but {mcs} was found !')
+
+def get_PDSCH_mcs(mcs: int) -> dict:
+    '''
+    Returns the entry of the mcs of a PDSCH (see `get_PDCCHU_mcs`).
+
+    Args:
+        :mcs: the mcs, from the PDCCHU (6 bits)
+    '''
+
+    if mcs not in PDSCH_MCS_TABLE:
+        raise NotImplementedError('Not implemented in this project')
+
+    return PDSCH_MCS_TABLE[mcs]
+
+def PDCCHU_nb_of_rb(mcs: int) -> int:
+    '''
+    Returns the number of resource blocks of a PDCCHU : its 36 bits, coded, then modulated, fill whole resource blocks.
+
+    Args:
+        :mcs: the mcs of the PDCCHU
+    '''
+
+    entry = get_PDCCHU_mcs(mcs)
+
+    return round(PDCCHU_BITS / entry['rate'] / entry['bits_per_symbol']) // RB_SIZE
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+File defining the OFDM front end : it turns raw time-domain IQ samples (as recorded) into the T/F matrix (as returned by `get_matrix`).
+
+A symbol is made of a cyclic prefix of N_CP samples, followed by N_FFT samples.
+The start of the first symbol is found by correlating the samples with the first synchronisation symbol (see `sync_symbols`).
+Then the cyclic prefixes are removed, all the symbols go through a single FFT, and the allocated subcarriers are kept.
+
+Raw IQ files are interleaved little endian float32 (real, imag) samples, as written by most recorders (e.g `.cf32` files).
+'''
+
+##-Imports
+import numpy as np
+
+from src.utils import N_FFT, crop_subcarriers, expand_subcarriers, sync_symbols
+
+##-Constants
+N_CP = 72 # Number of samples of the cyclic prefix (normal cyclic prefix for a 1024 points FFT)
+IQ_EXTENSIONS = ('.iq', '.cf32')
+
+##-Modulation
+def ofdm_modulate(matrix: np.ndarray, fft_size: int = N_FFT, n_cp: int = N_CP) -> np.ndarray:
+    '''
+    Builds the time-domain samples of a matrix (inverse of `ofdm_demodulate`) : one inverse FFT per symbol, and the cyclic prefixes.
+
+    Args:
+        :matrix:   the matrix, of shape (n_symbols, 624)
+        :fft_size: the size of the FFT
+        :n_cp:     the number of samples of the cyclic prefix
+
+    Returns:
+        np.ndarray: the samples, of length n_symbols * (fft_size + n_cp)
+    '''
+
+    symbols = np.fft.ifft(expand_subcarriers(matrix, fft_size), axis=1)
+
+    return np.concatenate((symbols[:, fft_size - n_cp :], symbols), axis=1).reshape(-1)
+
+def sync_waveform(fft_size: int = N_FFT) -> np.ndarray:
+    '''Returns the time-domain samples of the first synchronisation symbol (without its cyclic prefix).'''
+
+    return np.fft.ifft(expand_subcarriers(sync_symbols()[0], fft_size)[0])
+
+##-Demodulation
+def find_timing(samples: np.ndarray, fft_size: int = N_FFT) -> int:
+    '''
+    Finds the start of the first synchronisation symbol (after its cyclic prefix), as the peak of the correlation
+    of the samples with `sync_waveform`. The correlation is computed with FFTs.
+
+    Args:
+        :samples:  the time-domain samples
+        :fft_size: the size of the FFT
+
+    Returns:
+        int: the index of the first sample of the first synchronisation symbol (the first sample after its cyclic prefix)
+    '''
+
+    ref = sync_waveform(fft_size)
+
+    if len(samples) < len(ref):
+        raise ValueError(f'find_timing: at least {len(ref)} samples are needed, but {len(samples)} were given')
+
+    n = len(samples) + len(ref) - 1
+    corr = np.fft.ifft(np.fft.fft(samples, n) * np.conj(np.fft.fft(ref, n)))
+
+    # corr[k] is the correlation with the reference starting at sample k (the last ones wrap around)
+    return int(np.argmax(np.abs(corr[: len(samples) - len(ref) + 1])))
+
+def ofdm_demodulate(samples: np.ndarray, start: int | None = None, n_symbols: int | None = None, fft_size: int = N_FFT, n_cp: int = N_CP, dtype: type = np.complex128) -> np.ndarray:
+    '''
+    Builds the T/F matrix from the time-domain samples, in the layout returned by `get_matrix`.
+
+    Args:
+        :samples:   the time-domain samples
+        :start:     the index of the first sample of the first symbol, after its cyclic prefix (None to find it with `find_timing`)
+        :n_symbols: the number of symbols to demodulate (None for all the complete symbols)
+        :fft_size:  the size of the FFT
+        :n_cp:      the number of samples of the cyclic prefix
+        :dtype:     the complex dtype of the returned matrix
+
+    Returns:
+        np.ndarray: the matrix, of shape (n_symbols, 624)
+    '''
+
+    samples = np.asarray(samples)
+
+    if start is None:
+        start = find_timing(samples, fft_size)
+
+    symbol_len = fft_size + n_cp
+    available = max((len(samples) - start - fft_size) // symbol_len + 1, 0)
+
+    if n_symbols is None:
+        n_symbols = available
+
+    elif n_symbols > available:
+        raise ValueError(f'ofdm_demodulate: {n_symbols} symbols were asked, but only {available} are complete')
+
+    # View of the symbols without their cyclic prefixes (one per row), transformed by a single FFT
+    windows = np.lib.stride_tricks.sliding_window_view(samples[start:], fft_size)[::symbol_len][:n_symbols]
+
+    return crop_subcarriers(np.fft.fft(windows, axis=1)).astype(dtype, copy=False)
+
+##-Files
+def load_iq(fn: str, n_cp: int = N_CP, dtype: type = np.complex128) -> np.ndarray:
+    '''
+    Loads the raw IQ file `fn` (interleaved float32), and demodulates it (see `ofdm_demodulate`).
+
+    Args:
+        :fn:    the file name
+        :n_cp:  the number of samples of the cyclic prefix
+        :dtype: the complex dtype of the returned matrix
+
+    Returns:
+        np.ndarray: the matrix, of shape (n_symbols, 624)
+    '''
+
+    return ofdm_demodulate(np.fromfile(fn, dtype='<c8'), n_cp=n_cp, dtype=dtype)
+
+def write_iq(fn: str, samples: np.ndarray):
+    '''Writes the time-domain samples to the raw IQ file `fn` (interleaved float32).'''
+
+    np.asarray(samples, dtype='<c8').tofile(fn)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+File defining the codec registry : the demodulators, FEC decoders and CRC checkers used by the decoder.
+
+Each codec is built once, on its first use, and then shared between the blocks, the users, the captures and the threads.
+The codecs do not have any state, so they can be used from several threads at the same time.
+'''
+
+##-Imports
+import threading
+from typing import Callable
+
+from src.crc import CRC, get_crc
+from src.hamming748 import Hamming748
+from src.mcs import get_PDSCH_mcs
+from src.viterbi import ViterbiDecoder
+
+##-Constants
+# Code name (see `src.mcs.CODES`) -> FEC decoder class
+FEC_DECODERS = {
+    'conv': ViterbiDecoder,
+    'hamming748': Hamming748,
+}
+
+##-Registry
+class CodecRegistry:
+    '''Thread-safe cache of the codecs, keyed by their mcs.'''
+
+    def __init__(self):
+        '''Constructor.'''
+
+        self._codecs = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key: tuple, build: Callable):
+        '''
+        Returns the codec `key`, building it with `build()` if it is not in the cache.
+        The lock is only taken on a miss, and the codec is built only once even if several threads miss at the same time.
+        '''
+
+        codec = self._codecs.get(key)
+
+        if codec is None:
+            with self._lock:
+                codec = self._codecs.get(key)
+
+                if codec is None:
+                    codec = build()
+                    self._codecs[key] = codec
+
+        return codec
+
+    def demod(self, mcs: int) -> tuple[Callable, int]:
+        '''
+        Returns the hard demodulator of a PDSCH.
+
+        Args:
+            :mcs: the mcs of the PDSCH
+
+        Returns:
+            tuple[Callable, int]: (demodulation function, number of bits per symbol)
+        '''
+
+        entry = get_PDSCH_mcs(mcs)
+
+        return entry['demod'], entry['bits_per_symbol']
+
+    def fec(self, mcs: int) -> ViterbiDecoder | Hamming748:
+        '''
+        Returns the FEC decoder of a PDSCH.
+
+        Args:
+            :mcs: the mcs of the PDSCH
+        '''
+
+        code = get_PDSCH_mcs(mcs)['code']
+
+        return self._get(('fec', code), FEC_DECODERS[code])
+
+    def hamming748(self) -> Hamming748:
+        '''Returns the Hamming748 decoder (used by the PBCH and the PDCCHU).'''
+
+        return self._get(('fec', 'hamming748'), Hamming748)
+
+    def viterbi(self) -> ViterbiDecoder:
+        '''Returns the Viterbi decoder of the convolutional code.'''
+
+        return self._get(('fec', 'conv'), ViterbiDecoder)
+
+    def crc(self, crc_flag: int) -> CRC:
+        '''
+        Returns the CRC checker (the table driven engines of `src.crc` are built once, when it is imported).
+
+        Args:
+            :crc_flag: the CRC flag of the PDCCHU (the size of the CRC is 8 * (crc_flag + 1))
+        '''
+
+        return get_crc(8 * (crc_flag + 1))
+
+# The registry shared by all the decoders
+registry = CodecRegistry()
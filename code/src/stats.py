@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+File defining the instrumentation of the decoding : wall time per stage, and counters.
+
+The instrumentation is opt-in : the functions take an optional `stats` argument, which is None by default.
+When it is None, nothing is measured (the only cost is the test `stats is not None`).
+'''
+
+##-Imports
+import threading
+import time
+from contextlib import nullcontext
+
+##-Constants
+STAGES = ('flatten', 'pbch', 'pdcchu', 'pdsch', 'demod', 'fec', 'crc') # 'demod', 'fec' and 'crc' are included in the three stages before them
+COUNTERS = (
+    'symbols_demodulated',
+    'codewords_decoded',      # Hamming748 codewords (8 bits each)
+    'viterbi_blocks_decoded', # Blocks decoded by the Viterbi decoder (one per convolutional PDSCH)
+    'hamming_corrected',
+    'hamming_dropped',
+    'crc_checked',
+    'crc_failed',
+)
+
+##-Stats
+class Stats:
+    '''
+    Accumulates the wall time spent in each stage of the decoding, and the counters.
+    It can be shared between threads.
+    '''
+
+    def __init__(self):
+        '''Constructor.'''
+
+        self.times = dict.fromkeys(STAGES, 0.0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self._lock = threading.Lock()
+
+    def add_time(self, stage: str, seconds: float):
+        '''Adds `seconds` to the time of `stage`.'''
+
+        with self._lock:
+            self.times[stage] = self.times.get(stage, 0.0) + seconds
+
+    def count(self, counter: str, n: int = 1):
+        '''Adds `n` to the counter `counter`.'''
+
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + int(n)
+
+    def stage(self, stage: str) -> '_Timer':
+        '''
+        Returns a context manager measuring the time spent in its block, and adding it to `stage`.
+
+        Example:
+            >>> with stats.stage('demod'):
+            ...     demoded = bpsk_demod_array(block)
+        '''
+
+        return _Timer(self, stage)
+
+    def merge(self, other: dict):
+        '''Adds the times and counters of `other` (as returned by `self.as_dict`) to this one.'''
+
+        for stage, seconds in other['times'].items():
+            self.add_time(stage, seconds)
+
+        for counter, n in other['counters'].items():
+            self.count(counter, n)
+
+    def as_dict(self) -> dict[str, dict]:
+        '''
+        Returns the stats.
+
+        Returns:
+            dict: {'times': {<stage>: <seconds>, ...}, 'counters': {<counter>: <value>, ...}}
+        '''
+
+        with self._lock:
+            return {'times': dict(self.times), 'counters': dict(self.counters)}
+
+class _Timer:
+    '''Context manager used by `Stats.stage`.'''
+
+    __slots__ = ('stats', 'stage', 't0')
+
+    def __init__(self, stats: Stats, stage: str):
+        self.stats = stats
+        self.stage = stage
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.add_time(self.stage, time.perf_counter() - self.t0)
+        return False
+
+##-Utils
+_NULL_CONTEXT = nullcontext()
+
+def stage(stats: Stats | None, name: str):
+    '''Returns `stats.stage(name)`, or a context manager that does nothing if `stats` is None.'''
+
+    if stats is None:
+        return _NULL_CONTEXT
+
+    return stats.stage(name)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+File defining a streaming decoder, for long captures made of several slots.
+
+The OFDM symbols are read one by one from a file or a pipe (csv or binary capture),
+grouped in slots of 14 symbols, and each slot is decoded independently.
+Only one slot is kept in memory at a time.
+'''
+
+##-Imports
+import io
+from typing import BinaryIO, Iterator
+
+import numpy as np
+
+from src.capture import HEADER, MAGIC, read_capture_header
+from src.decode import DecodeMatrix
+from src.utils import N_RE, crop_subcarriers
+
+##-Constants
+N_SYMB_SLOT = 14 # Number of OFDM symbols in a slot
+
+##-Reading
+def iter_symbols(f: BinaryIO) -> Iterator[np.ndarray]:
+    '''
+    Reads the OFDM symbols from `f` one by one.
+    The format (csv or binary capture) is detected from the first bytes.
+
+    Args:
+        :f: a binary file object (a file, or `sys.stdin.buffer`)
+
+    Yields:
+        np.ndarray: each symbol, as an array of 624 complex numbers
+    '''
+
+    start = f.read(len(MAGIC))
+
+    if start == MAGIC:
+        header = read_capture_header(io.BytesIO(start + f.read(HEADER.size - len(MAGIC))))
+        row_size = header['n_re'] * header['dtype'].itemsize
+
+        while True:
+            raw = f.read(row_size)
+
+            if len(raw) < row_size:
+                return
+
+            yield np.frombuffer(raw, dtype=header['dtype'])
+
+    else:
+        line = start + f.readline()
+
+        while line != b'':
+            if line.strip() != b'':
+                row = np.fromstring(line.decode(), sep=';') # Real and imaginary parts are interleaved
+                yield crop_subcarriers(row.view(np.complex128))[0]
+
+            line = f.readline()
+
+def iter_slots(f: BinaryIO, slot_len: int = N_SYMB_SLOT) -> Iterator[np.ndarray]:
+    '''
+    Reads the symbols from `f` and groups them by slot.
+    An incomplete slot at the end of the stream is ignored.
+
+    Args:
+        :f:        a binary file object
+        :slot_len: the number of symbols in a slot
+
+    Yields:
+        np.ndarray: each slot, as a matrix of shape (slot_len, 624)
+    '''
+
+    slot = np.empty((slot_len, N_RE), dtype=np.complex128)
+    k = 0
+
+    for symbol in iter_symbols(f):
+        slot[k] = symbol
+        k += 1
+
+        if k == slot_len:
+            yield slot
+
+            slot = np.empty((slot_len, N_RE), dtype=np.complex128)
+            k = 0
+
+##-Decoding
+def decode_slot(matrix: np.ndarray) -> dict:
+    '''
+    Decodes the PBCH, and then the PDCCHU and PDSCH of every user of a slot.
+
+    Args:
+        :matrix: the slot, of shape (14, 624)
+
+    Returns:
+        dict: {'cell_ident': <cell_ident>, 'user_nb': <user_nb>, 'users': <result of `DecodeMatrix.decode_all`>, 'error': <error or None>}
+    '''
+
+    d = DecodeMatrix(matrix)
+    ret = {'cell_ident': None, 'user_nb': None, 'users': [], 'error': None}
+
+    try:
+        ret['cell_ident'], ret['user_nb'] = d.decode_PBCH_header()
+        ret['users'] = d.decode_all()
+    except ValueError as err:
+        ret['error'] = str(err)
+
+    return ret
+
+def stream_decode(f: BinaryIO, slot_len: int = N_SYMB_SLOT) -> Iterator[tuple[int, dict]]:
+    '''
+    Decodes the capture read from `f` slot by slot, in bounded memory.
+
+    Args:
+        :f:        a binary file object
+        :slot_len: the number of symbols in a slot
+
+    Yields:
+        tuple[int, dict]: (slot index, result of `decode_slot`)
+    '''
+
+    for slot_idx, slot in enumerate(iter_slots(f, slot_len)):
+        yield slot_idx, decode_slot(slot)
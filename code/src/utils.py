@@ -7,51 +7,103 @@
 import numpy as np
 import math
 
-# To display T/F matrix
-import matplotlib.pyplot as plt
-from matplotlib import ticker, cm
+# matplotlib (to display the T/F matrix) is imported on first use, in `power_distrib_graph` :
+# importing it takes longer than the decoding of a matrix.
 
-# Unit testing
-import pytest
-
-# Convolutional decoder
-import sk_dsp_comm.fec_conv as fec
+##-Constants
+N_FFT = 1024 # Size of the FFT (number of bins in a row of the csv file)
+N_RE = 624   # Number of allocated subcarriers
 
 ##-Functions
-def get_matrix(fn: str) -> list[list[np.complex128]]:
+def crop_subcarriers(mat_complex: np.ndarray, n_re: int = N_RE) -> np.ndarray:
+    '''
+    Keeps only the allocated subcarriers of a full FFT grid.
+
+    The `n_re` allocated subcarriers are split in two bands around the DC bin (which is not used):
+    the bins [1 ; n_re // 2] and the last n_re // 2 bins.
+
+    Args:
+        :mat_complex: the complex matrix, of shape (n_symbols, fft_size)
+        :n_re:        the number of allocated subcarriers
+
+    Returns:
+        np.ndarray: a contiguous matrix of shape (n_symbols, n_re)
+    '''
+
+    mat_complex = np.atleast_2d(mat_complex)
+    fft_size = mat_complex.shape[1]
+
+    bound_1 = n_re // 2 + 1
+    bound_2 = fft_size - n_re // 2
+
+    # The short matrix is [1 : bound_1] + [bound_2 : ]
+    return np.concatenate((mat_complex[:, 1:bound_1], mat_complex[:, bound_2:]), axis=1)
+
+def expand_subcarriers(matrix: np.ndarray, fft_size: int = N_FFT) -> np.ndarray:
+    '''
+    Places the allocated subcarriers back in a full FFT grid (inverse of `crop_subcarriers`). The unused bins are set to 0.
+
+    Args:
+        :matrix:   the matrix, of shape (n_symbols, n_re)
+        :fft_size: the size of the FFT
+
+    Returns:
+        np.ndarray: the full grid, of shape (n_symbols, fft_size)
+    '''
+
+    matrix = np.atleast_2d(matrix)
+    half = matrix.shape[1] // 2
+
+    grid = np.zeros((matrix.shape[0], fft_size), dtype=np.result_type(matrix.dtype, np.complex64))
+    grid[:, 1 : half + 1] = matrix[:, :half]
+    grid[:, fft_size - half :] = matrix[:, half:]
+
+    return grid
+
+def get_matrix(fn: str, dtype: type = np.complex128) -> np.ndarray:
     '''
     Parse the csv file `fn` and return the associated matrix.
 
     It removes the unused part.
 
     Args:
-        :fn: the file name
+        :fn:    the file name
+        :dtype: the complex dtype of the returned matrix (np.complex128 or np.complex64)
+
+    Returns:
+        np.ndarray: the matrix, of shape (n_symbols, 624)
     '''
 
     #---Read from file
-    data = np.genfromtxt(fn, delimiter=';')
+    data = np.loadtxt(fn, delimiter=';', dtype=np.float64, ndmin=2)
 
-    mat_complex = data[:,0::2] + 1j * data[:,1::2] # Merges the real and imaginary part of the signal
+    # Real and imaginary parts are interleaved, so the rows can be read as complex numbers without copy
+    mat_complex = data.view(np.complex128)
 
     #---Remove the unused part (only 624 subcarriers are allocated)
-    N_Re = 624
-    N = 1024
+    return crop_subcarriers(mat_complex).astype(dtype, copy=False)
+
+
+def sync_symbols(n_re: int = N_RE) -> np.ndarray:
+    '''
+    Returns the two synchronisation symbols (the first two rows of the matrix), after the removal of the unused subcarriers.
+
+    The first one is a chirp of length n_re // 2, repeated on both bands (its amplitude is sqrt(2)),
+    and the second one is its conjugate.
 
-    # bound_1 = N_Re // 2 - 1
-    # bound_2 = N - (N_Re // 2) + 1
-    bound_1 = N_Re // 2 + 1
-    bound_2 = N - (N_Re // 2)
+    Args:
+        :n_re: the number of allocated subcarriers
+
+    Returns:
+        np.ndarray: the symbols, of shape (2, n_re)
+    '''
 
-    # The short matrix is from range [0 : bound_1] + [bound_2 : ]
-    a = [
-        [mat_complex[i][j] for j in range(1, bound_1 + 1)]
-        + [mat_complex[i][j] for j in range(bound_2 + 1, N)]
-        for i in range(len(mat_complex))
-    ]
+    half = n_re // 2
+    k = np.arange(n_re) % half + 1
 
-    # tf_mat_short = np.array(a)
-    return a
+    chirp = math.sqrt(2) * np.exp(1j * np.pi * k**2 / half)
 
+    return np.array([chirp, np.conj(chirp)])
 
 def print_matrix(m):
     '''
@@ -86,22 +138,68 @@ def print_matrix(m):
     # print(f'max imag : {mx_i}')
     pass
 
-def power_distrib_graph(Z):
+def block_average(grid: np.ndarray, max_shape: tuple[int, int]) -> np.ndarray:
+    '''
+    Reduces `grid` to at most `max_shape` by averaging it over blocks (the blocks at the end can be smaller).
+
+    Args:
+        :grid:      the real matrix, of shape (n_rows, n_cols)
+        :max_shape: the maximum (n_rows, n_cols) of the result
+
+    Returns:
+        np.ndarray: the averaged matrix, of shape (ceil(n_rows / fy), ceil(n_cols / fx)), with fy = ceil(n_rows / max_shape[0]) (same for fx)
+    '''
+
+    n_rows, n_cols = grid.shape
+    fy = -(-n_rows // max_shape[0])
+    fx = -(-n_cols // max_shape[1])
+
+    if fy == fx == 1:
+        return grid
+
+    ny, nx = -(-n_rows // fy), -(-n_cols // fx)
+
+    # The grid is padded with NaN to a multiple of the blocks, which are then averaged without the padding
+    padded = np.full((ny * fy, nx * fx), np.nan)
+    padded[:n_rows, :n_cols] = grid
+
+    return np.nanmean(padded.reshape(ny, fy, nx, fx), axis=(1, 3))
+
+def power_distrib_graph(Z, fn: str | None = None, max_shape: tuple[int, int] = (1024, N_RE)):
     '''
     Draws the power distribution graph.
 
-    - Z : the matrix
+    The power is averaged over blocks (see `block_average`) so that the image has at most `max_shape` pixels, whatever the length of the capture.
+
+    Args:
+        :Z:         the matrix
+        :fn:        the image file (its extension gives the format, e.g .png or .svg). If None, the graph is shown in a window (which blocks).
+        :max_shape: the maximum (n_symbols, n_subcarriers) of the drawn grid
     '''
 
-    fig, ax = plt.subplots()
-    cs = ax.contourf(np.linspace(0, len(Z[0]), len(Z[0])), np.linspace(0, len(Z), len(Z)), np.abs(Z) **2)
-    cbar = fig.colorbar(cs)
+    Z = np.asarray(Z)
+    power = block_average(Z.real**2 + Z.imag**2, max_shape)
 
-    ax.set_title('??')
-    ax.set_xlabel('frequency')
-    ax.set_ylabel('time')
+    if fn is None:
+        import matplotlib.pyplot as plt
+        fig = plt.figure()
+    else:
+        # A figure without pyplot is not attached to any interactive backend : it can be saved on a server without display
+        from matplotlib.figure import Figure
+        fig = Figure()
 
-    plt.show()
+    ax = fig.add_subplot()
+    im = ax.imshow(power, aspect='auto', origin='lower', interpolation='nearest', extent=(0, Z.shape[1], 0, Z.shape[0]))
+    fig.colorbar(im, ax=ax)
+
+    ax.set_title('Power distribution')
+    ax.set_xlabel('frequency (subcarrier)')
+    ax.set_ylabel('time (symbol)')
+
+    if fn is None:
+        plt.show()
+    else:
+        fig.savefig(fn)
 
 def flatten_index(i: int, j: int, width: int = 624) -> int:
     """Returns the flatten index of the (i, j) element in the flattened matrix.
@@ -141,3 +239,19 @@ def bin2dec(nb: list[int]) -> int:
     """
 
     return int(''.join(str(k) for k in nb), 2)
+
+def dec2bin(nb: int, n_bits: int) -> list[int]:
+    """Converts a number to base 2 (inverse of `bin2dec`).
+
+    Args:
+        nb (int): the number.
+        n_bits (int): the number of bits of the output.
+
+    Returns:
+        list[int]: the `n_bits` bits of the number, the most significant one first.
+    """
+
+    if not 0 <= nb < 2**n_bits:
+        raise ValueError(f'dec2bin: {nb} cannot be written with {n_bits} bits')
+
+    return [(nb >> (n_bits - 1 - k)) & 1 for k in range(n_bits)]
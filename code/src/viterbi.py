@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+File implementing the rate 1/2, K = 7 convolutional code (1011011, 1111001) used by the PDSCH, and its Viterbi decoder.
+
+The trellis follows the conventions of `sk_dsp_comm.fec_conv.FECConv(('1011011', '1111001'))` :
+    - the state is the six last input bits, the most recent one being the most significant bit ;
+    - for each input bit, the output of the first generator is placed first.
+'''
+
+##-Imports
+import numpy as np
+
+##-Constants
+G = ('1011011', '1111001') # Generator polynomials
+K = len(G[0])              # Constraint length
+N_STATES = 2**(K - 1)      # Number of states of the trellis
+DEPTH = 6                  # Decision depth of the reference decoder. Its last DEPTH - 1 bits are not output.
+
+##-Trellis
+def _build_trellis() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    '''
+    Builds the tables of the trellis.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]:
+            - predecessors, of shape (N_STATES, 2) : the two states leading to each state ;
+            - branch outputs, of shape (N_STATES, 2) : the index (2 * out_1 + out_2) of the output bits of each of these transitions ;
+            - signs, of shape (4, 2) : the output bits of each index, mapped to -1 (bit 0) and +1 (bit 1).
+    '''
+
+    predecessors = np.zeros((N_STATES, 2), dtype=np.intp)
+    outputs = np.zeros((N_STATES, 2), dtype=np.intp)
+
+    for state in range(N_STATES):
+        u = state >> (K - 2) # The input bit leading to `state` is its most significant bit
+
+        for k in range(2):
+            prev = ((state << 1) & (N_STATES - 1)) | k
+            register = [u] + [(prev >> (K - 2 - m)) & 1 for m in range(K - 1)] # [input, most recent bit, ..., oldest bit]
+
+            out = [sum(int(g[m]) * register[m] for m in range(K)) & 1 for g in G]
+
+            predecessors[state, k] = prev
+            outputs[state, k] = 2 * out[0] + out[1]
+
+    signs = np.array([[2 * (idx >> 1) - 1, 2 * (idx & 1) - 1] for idx in range(4)], dtype=np.float64)
+
+    return predecessors, outputs, signs
+
+PREDECESSORS, BRANCH_OUTPUTS, BRANCH_SIGNS = _build_trellis()
+
+##-Encoder
+def conv_encode(bits: list[int] | np.ndarray) -> np.ndarray:
+    '''
+    Encodes `bits` with the convolutional code, starting from the all zero state.
+
+    Args:
+        :bits: the bits to encode
+
+    Returns:
+        np.ndarray: the encoded bits (uint8), twice as long as the input
+    '''
+
+    bits = np.asarray(bits, dtype=np.int64).reshape(-1)
+
+    if len(bits) == 0:
+        return np.zeros(0, dtype=np.uint8)
+
+    out = np.empty((len(bits), 2), dtype=np.uint8)
+    for k, g in enumerate(G):
+        taps = np.array([int(c) for c in g])
+        out[:, k] = np.convolve(bits, taps)[:len(bits)] & 1
+
+    return out.reshape(-1)
+
+##-Decoder
+class ViterbiDecoder:
+    '''
+    Viterbi decoder for the convolutional code (1011011, 1111001).
+
+    The add-compare-select is done for all the 64 states at once, and for several codewords at once.
+    The survivor path is traced back from the best final state (no truncation of the traceback).
+    '''
+
+    def __init__(self, depth: int = DEPTH):
+        '''
+        Constructor.
+
+        Args:
+            :depth: the decision depth. The last `depth - 1` decoded bits are dropped, as in the reference decoder.
+        '''
+
+        self.depth = depth
+
+    def decode(self, x: list[int] | np.ndarray, metric: str = 'hard') -> np.ndarray:
+        '''
+        Decodes one codeword.
+
+        Args:
+            :x:      the received bits (for metric 'hard', 0 / 1 values) or LLRs (for metric 'soft', positive for a 1)
+            :metric: 'hard' or 'soft'
+
+        Returns:
+            np.ndarray: the decoded bits (uint8)
+        '''
+
+        return self.decode_batch(np.asarray(x).reshape(1, -1), metric)[0]
+
+    def decode_batch(self, x: np.ndarray, metric: str = 'hard') -> np.ndarray:
+        '''
+        Decodes several codewords of the same length in a single pass.
+
+        Args:
+            :x:      the received values, of shape (n_codewords, 2 * L)
+            :metric: 'hard' or 'soft' (see `self.decode`)
+
+        Returns:
+            np.ndarray: the decoded bits (uint8), of shape (n_codewords, L - depth + 1)
+        '''
+
+        x = np.atleast_2d(np.asarray(x))
+
+        if x.shape[1] % 2 != 0:
+            raise ValueError('ViterbiDecoder: decode_batch: the length of the codewords should be even')
+
+        if metric == 'hard':
+            soft = 2.0 * x.astype(np.float64) - 1 # 0 -> -1, 1 -> +1
+        elif metric == 'soft':
+            soft = x.astype(np.float64)
+        else:
+            raise ValueError(f'ViterbiDecoder: decode_batch: unknown metric "{metric}"')
+
+        batch, L = x.shape[0], x.shape[1] // 2
+        n_out = max(L - self.depth + 1, 0)
+
+        if L == 0:
+            return np.zeros((batch, 0), dtype=np.uint8)
+
+        # Branch metrics of the four possible outputs for every step (the smaller, the better) : (batch, L, 4)
+        branch_metrics = -soft.reshape(batch, L, 2) @ BRANCH_SIGNS.T
+
+        path_metrics = np.zeros((batch, N_STATES))
+        decisions = np.empty((L, batch, N_STATES), dtype=bool)
+
+        for t in range(L):
+            candidates = path_metrics[:, PREDECESSORS] + branch_metrics[:, t, BRANCH_OUTPUTS] # (batch, N_STATES, 2)
+
+            decisions[t] = candidates[:, :, 1] < candidates[:, :, 0] # On a tie, keep the first predecessor
+            path_metrics = np.where(decisions[t], candidates[:, :, 1], candidates[:, :, 0])
+
+        #---Traceback
+        rows = np.arange(batch)
+        state = np.argmin(path_metrics, axis=1)
+        decoded = np.empty((batch, L), dtype=np.uint8)
+
+        for t in range(L - 1, -1, -1):
+            decoded[:, t] = state >> (K - 2)
+            state = PREDECESSORS[state, decisions[t, rows, state].astype(np.intp)]
+
+        return decoded[:, :n_out]
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##-Imports
+import io
+import json
+import os
+import shutil
+import tempfile
+
+import src.batch
+from src.batch import decode_capture, list_captures, run_batch
+from src.capture import convert_csv
+
+##-Functions
+def decode_or_crash(fn: str, cache_dir: str | None = None) -> dict:
+    '''`decode_capture`, except that the worker process dies on the captures named "crash.csv".'''
+
+    if os.path.basename(fn) == 'crash.csv':
+        os._exit(1)
+
+    return decode_capture(fn, cache_dir)
+
+def make_captures(d: str) -> list[str]:
+    '''Writes a good csv capture, a bad one, a good binary capture and a file that is not a capture in `d`.'''
+
+    shutil.copy('data/tfMatrix.csv', os.path.join(d, 'a.csv'))
+
+    with open(os.path.join(d, 'b.csv'), 'w') as f:
+        f.write('not;a;capture\n')
+
+    convert_csv('data/tfMatrix.csv', os.path.join(d, 'c.tfm'))
+
+    with open(os.path.join(d, 'notes.txt'), 'w') as f:
+        f.write('ignored\n')
+
+    return [os.path.join(d, fn) for fn in ('a.csv', 'b.csv', 'c.tfm')]
+
+def read_lines(out: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+##-Tests
+def test_list_captures():
+    with tempfile.TemporaryDirectory() as d:
+        files = make_captures(d)
+
+        assert list_captures([d]) == files
+        assert list_captures(['x.csv', d]) == ['x.csv'] + files
+
+def test_decode_capture():
+    res = decode_capture('data/tfMatrix.csv')
+    assert res['status'] == 'ok' and res['error'] is None
+    assert (res['cell_ident'], res['user_nb']) == (12345, 18)
+    assert all(set(user['payload']) <= {'0', '1'} for user in res['users'])
+
+    res = decode_capture('not_a_file.csv')
+    assert res['status'] == 'error' and res['error'].startswith('FileNotFoundError')
+    assert res['users'] == []
+
+def test_run_batch():
+    with tempfile.TemporaryDirectory() as d:
+        files = make_captures(d)
+
+        out = io.StringIO()
+        assert run_batch([d], out, 2) == (2, 1)
+
+        lines = read_lines(out)
+        assert [line['file'] for line in lines] == files
+        assert [line['status'] for line in lines] == ['ok', 'error', 'ok']
+        assert lines[0]['error'] is None and lines[1]['error'] is not None
+        assert lines[0]['users'] == lines[2]['users']
+
+def test_run_batch_crash():
+    # A worker process that dies only loses its own capture
+    with tempfile.TemporaryDirectory() as d:
+        files = make_captures(d)
+        crash = os.path.join(d, 'crash.csv')
+        shutil.copy('data/tfMatrix.csv', crash)
+        files.insert(2, crash)
+
+        decode = src.batch.decode_capture
+        src.batch.decode_capture = decode_or_crash
+
+        try:
+            out = io.StringIO()
+            assert run_batch(files, out, 2) == (2, 2)
+        finally:
+            src.batch.decode_capture = decode
+
+        lines = read_lines(out)
+        assert [line['file'] for line in lines] == files
+        assert [line['status'] for line in lines] == ['ok', 'error', 'error', 'ok']
+        assert lines[2]['error'].startswith('BrokenProcessPool')
+        assert not lines[1]['error'].startswith('BrokenProcessPool')
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##-Imports
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from src.cache import ResultCache, cached_decode
+from src.capture import write_capture
+from src.decode import DecodeMatrix
+from src.generator import build_matrix, random_users
+from src.utils import get_matrix
+
+##-Tests
+def test_cache():
+    m = get_matrix('data/tfMatrix.csv')
+    expected = DecodeMatrix(m).decode_all()
+
+    with tempfile.TemporaryDirectory() as d:
+        cache = ResultCache(os.path.join(d, 'cache'))
+
+        res = cached_decode('data/tfMatrix.csv', cache)
+        assert not res['cached'] and res['users'] == expected
+
+        res = cached_decode('data/tfMatrix.csv', cache)
+        assert res['cached'] and res['users'] == expected
+        assert (res['cell_ident'], res['user_nb']) == DecodeMatrix(m).decode_PBCH_header()
+
+        # The entries are addressed by the content of the capture, not by its name
+        fn = os.path.join(d, 'copy.csv')
+        shutil.copy('data/tfMatrix.csv', fn)
+        assert cached_decode(fn, cache)['cached']
+
+        # The parsed matrix is cached too
+        assert np.array_equal(cache.load_matrix(fn), m)
+
+        # The entries can be read by the other users sharing the cache (according to the umask)
+        mask = os.umask(0o022)
+        os.umask(mask)
+        modes = {os.stat(os.path.join(cache.directory, name)).st_mode & 0o777 for name in os.listdir(cache.directory)}
+        assert modes == {0o666 & ~mask}
+
+        # Other options give other results
+        res = cached_decode('data/tfMatrix_2.csv', cache, 'zf')
+        assert not res['cached'] and all(r['crc_ok'] for r in res['users'])
+        assert not cached_decode('data/tfMatrix_2.csv', cache)['cached']
+        assert cached_decode('data/tfMatrix_2.csv', cache, 'zf')['cached']
+
+        cache.clear()
+        assert cache.size() == 0
+        assert not cached_decode('data/tfMatrix.csv', cache)['cached']
+
+def test_cache_eviction():
+    rng = np.random.default_rng(6)
+
+    with tempfile.TemporaryDirectory() as d:
+        files = []
+        for k in range(4):
+            fn = os.path.join(d, f'{k}.tfm')
+            write_capture(fn, build_matrix(k, random_users(2, rng=rng)))
+            files.append(fn)
+
+        cache = ResultCache(os.path.join(d, 'cache'))
+
+        def is_cached(fn: str) -> bool:
+            return cache.digest(fn) + '.tfm' in os.listdir(cache.directory)
+
+        cache.load_matrix(files[0])
+        entry_size = cache.size()
+
+        # Room for three matrices : the least recently used one is evicted
+        cache.max_bytes = int(3.5 * entry_size)
+        for fn in files[1:3]:
+            time.sleep(0.01) # The last use is given by the modification time
+            cache.load_matrix(fn)
+
+        time.sleep(0.01)
+        cache.load_matrix(files[0])
+
+        time.sleep(0.01)
+        cache.load_matrix(files[3])
+
+        assert cache.size() <= cache.max_bytes
+        assert [is_cached(fn) for fn in files] == [True, False, True, True]
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##-Imports
+import io
+import os
+import tempfile
+
+import numpy as np
+
+from src.capture import is_capture, load_capture, load_matrix, write_capture
+from src.stream import iter_slots
+
+##-Tests
+def test_capture_roundtrip():
+    rng = np.random.default_rng(0)
+    m = rng.standard_normal((14, 624)) + 1j * rng.standard_normal((14, 624))
+
+    with tempfile.TemporaryDirectory() as d:
+        fn = os.path.join(d, 'm.tfm')
+
+        # Lossless with complex128
+        write_capture(fn, m, dtype=np.complex128)
+        assert is_capture(fn)
+        m2 = load_capture(fn)
+        assert isinstance(m2, np.memmap)
+        assert m2.shape == m.shape
+        assert np.array_equal(m2, m)
+        assert np.array_equal(load_capture(fn, mmap=False), m)
+
+        # complex64 (default)
+        write_capture(fn, m)
+        assert np.allclose(load_matrix(fn), m, atol=1e-6)
+
+def test_capture_bad_file():
+    with tempfile.TemporaryDirectory() as d:
+        fn = os.path.join(d, 'bad.tfm')
+
+        with open(fn, 'wb') as f:
+            f.write(b'TFM1\x00')
+
+        assert is_capture(fn)
+
+        try:
+            load_capture(fn)
+        except ValueError:
+            pass
+        else:
+            assert False
+
+def test_stream_slots():
+    rng = np.random.default_rng(1)
+    m = rng.standard_normal((35, 624)) + 1j * rng.standard_normal((35, 624))
+
+    with tempfile.TemporaryDirectory() as d:
+        fn = os.path.join(d, 'm.tfm')
+        write_capture(fn, m, dtype=np.complex128)
+
+        with open(fn, 'rb') as f:
+            slots = list(iter_slots(f))
+
+    # The last incomplete slot is ignored
+    assert len(slots) == 2
+    assert np.array_equal(slots[1], m[14:28])
+
+    # Csv input (full FFT grid, with interleaved real and imaginary parts)
+    full = np.zeros((14, 1024), dtype=np.complex128)
+    full[:, 1:313] = m[:14, :312]
+    full[:, 712:] = m[:14, 312:]
+
+    csv = '\n'.join(';'.join(repr(float(x)) for x in row) for row in full.view(np.float64)) + '\n'
+    slots = list(iter_slots(io.BytesIO(csv.encode())))
+
+    assert len(slots) == 1
+    assert np.array_equal(slots[0], m[:14])
+
+if __name__ == '__main__':
+    test_capture_roundtrip()
+    test_capture_bad_file()
+    test_stream_slots()
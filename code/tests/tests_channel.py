@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##-Imports
+import numpy as np
+
+from src.channel import equalize_matrix, estimate_channel, estimate_noise_var
+from src.decode import DecodeMatrix
+from src.generator import MAX_USERS, build_matrix, random_users
+from src.utils import N_RE, get_matrix
+from tests.utils import test_error
+
+##-Functions
+def multipath_channel(taps: list[complex], n_re: int = N_RE) -> np.ndarray:
+    '''Returns the frequency response, on the allocated subcarriers, of a channel with the impulse response `taps`.'''
+
+    return np.fft.fft(taps, n_re)
+
+def n_decoded(matrix: np.ndarray, users: list[dict]) -> int:
+    '''Returns the number of users whose payload is decoded.'''
+
+    return sum(r['crc_ok'] and r['text'].startswith(u['payload'].decode()) for r, u in zip(DecodeMatrix(matrix).decode_all(), users))
+
+##-Tests
+def test_inverted_capture():
+    # The channel of tfMatrix_2.csv is -1
+    m = get_matrix('data/tfMatrix_2.csv')
+
+    assert np.allclose(estimate_channel(m), -1, atol=1e-2)
+    assert np.allclose(estimate_channel(m, 7, 'linear'), -1, atol=1e-2)
+
+    res = DecodeMatrix(equalize_matrix(m)).decode_all()
+    assert all(r['error'] is None and r['crc_ok'] for r in res)
+    assert res[0]['text'].startswith('User 16: your key is 23')
+
+def test_equalize():
+    rng = np.random.default_rng(3)
+    users = random_users(MAX_USERS, rng=rng)
+    h = multipath_channel([0.8, 0.5j, -0.3])
+
+    m = build_matrix(1, users) * h
+    assert n_decoded(m, users) < MAX_USERS // 2
+    assert np.allclose(estimate_channel(m), h)
+    assert np.allclose(estimate_channel(m, time='linear'), h)
+
+    for method in ('zf', 'mmse'):
+        assert n_decoded(equalize_matrix(m, method), users) == MAX_USERS
+
+    # With noise, the smoothing reduces the error of the estimate
+    noisy = build_matrix(1, users, noise_var=0.02, rng=rng) * h
+    err = [np.mean(np.abs(estimate_channel(noisy, w) - h)**2) for w in (1, 5)]
+    assert err[1] < err[0]
+    assert 0.01 < estimate_noise_var(noisy) < 0.04
+
+    for method in ('zf', 'mmse'):
+        assert n_decoded(equalize_matrix(noisy, method, 5), users) == MAX_USERS
+
+    small = np.ones((3, 12), dtype=np.complex128)
+    assert test_error('estimate_channel', ValueError, estimate_channel, small, 1, 'cubic')
+    assert test_error('equalize_matrix', ValueError, equalize_matrix, small, 'ml')
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##-Imports
+import os
+import tempfile
+
+import numpy as np
+
+from src.capture import write_capture
+from src.decode import DecodeMatrix, _decode_PDSCH_batch, _decode_PDSCH_no_raise
+from src.generator import MAX_USERS, build_capture, build_matrix, random_users
+from src.stream import stream_decode
+from src.utils import get_matrix, sync_symbols
+
+##-Tests
+def test_sync_symbols():
+    m = get_matrix('data/tfMatrix.csv')
+    assert np.allclose(m[:2], sync_symbols(), atol=1e-2)
+
+def test_generator_roundtrip():
+    # Every implemented mcs, with both PDCCHU modulations
+    users = [
+        {'user_ident': 3, 'mcs': 5, 'crc_flag': 0, 'payload': 'bpsk, convolutional', 'pdcchu_mcs': 0},
+        {'user_ident': 7, 'mcs': 6, 'crc_flag': 1, 'payload': 'qpsk, convolutional'},
+        {'user_ident': 9, 'mcs': 7, 'crc_flag': 2, 'payload': '16qam, convolutional'},
+        {'user_ident': 12, 'mcs': 25, 'crc_flag': 3, 'payload': 'bpsk, Hamming748', 'pdcchu_mcs': 0},
+        {'user_ident': 40, 'mcs': 26, 'crc_flag': 0, 'payload': 'qpsk, Hamming748'},
+        {'user_ident': 200, 'mcs': 27, 'crc_flag': 1, 'payload': '16qam, Hamming748'},
+    ]
+
+    d = DecodeMatrix(build_matrix(4242, users))
+    assert d.decode_PBCH_header() == (4242, len(users))
+
+    for user, res in zip(users, d.decode_all()):
+        assert res['user_ident'] == user['user_ident']
+        assert res['pdcchu']['mcs'] == user['mcs'] and res['pdcchu']['crc_flag'] == user['crc_flag']
+        assert res['crc_ok']
+        assert res['text'].startswith(user['payload'])
+
+def test_generator_noise():
+    rng = np.random.default_rng(0)
+    users = random_users(MAX_USERS, rng=rng)
+
+    res = DecodeMatrix(build_matrix(1, users, noise_var=0.05, rng=rng)).decode_all()
+
+    assert len(res) == MAX_USERS
+    assert all(r['crc_ok'] and r['text'].startswith(u['payload'].decode()) for r, u in zip(res, users))
+
+def test_generator_slots():
+    rng = np.random.default_rng(1)
+    slots = [(k, random_users(k + 1, rng=rng)) for k in range(3)]
+
+    with tempfile.TemporaryDirectory() as d:
+        fn = os.path.join(d, 'slots.tfm')
+        write_capture(fn, build_capture(slots))
+
+        with open(fn, 'rb') as f:
+            results = list(stream_decode(f))
+
+    assert len(results) == len(slots)
+
+    for (_, res), (cell_ident, users) in zip(results, slots):
+        assert res['cell_ident'] == cell_ident
+        assert [r['text'][:4] for r in res['users']] == [u['payload'].decode() for u in users]
+
+def test_decode_batch():
+    # The batched decoding gives the same results as the sequential one, for every mcs, with and without soft decisions
+    rng = np.random.default_rng(2)
+    users = random_users(MAX_USERS, payload_size=1, mcs=(5, 6, 7, 25, 26, 27), crc_flags=(0, 1, 2, 3), rng=rng)
+    m = build_matrix(1, users, n_symbols=40, noise_var=0.2, rng=rng)
+
+    for soft in (True, False):
+        assert DecodeMatrix(m, soft).decode_all('batch') == DecodeMatrix(m, soft).decode_all()
+
+    # Same counters
+    d1, d2 = DecodeMatrix(m, stats=True), DecodeMatrix(m, stats=True)
+    d1.decode_all()
+    d2.decode_all('batch')
+    assert d1.get_stats()['counters'] == d2.get_stats()['counters']
+
+    # Same results on a corrupted capture : strong noise, then quantized samples, which give many ties in the Viterbi decoder.
+    # The soft decoding then depends on the scale of the LLRs of each user (the batched decoding has to use the noise variance of each user).
+    rng = np.random.default_rng(8)
+    users = random_users(40, payload_size=2, mcs=(7,), rng=rng)
+    corrupted = build_matrix(1, users, n_symbols=30, rng=rng)
+    noise_var = rng.uniform(0.1, 1.0, (len(corrupted) - 4, 1)) # Depends on the symbol, so on the user
+    shape = corrupted[4:].shape
+    noisy = corrupted[4:] + np.sqrt(noise_var / 2) * (rng.standard_normal(shape) + 1j * rng.standard_normal(shape))
+    corrupted[4:] = np.round(noisy * np.sqrt(10)) / np.sqrt(10)
+
+    for soft in (True, False):
+        assert DecodeMatrix(corrupted, soft).decode_all('batch') == DecodeMatrix(corrupted, soft).decode_all()
+
+    # Same error for a Hamming748 region that is not made of whole codewords (12 bpsk symbols)
+    flat = m[2:].reshape(-1)
+    pdcchu = {'user_ident': 1, 'mcs': 25, 'symb_start': 3, 'rb_start': 1, 'rb_size': 1, 'crc_flag': 0}
+    assert _decode_PDSCH_batch(flat, [pdcchu], True) == [_decode_PDSCH_no_raise(flat, pdcchu, True)]
+
+def test_decode_parallel():
+    # The thread and process pools give the same results as the sequential decoding, on a capture and on a generated slot
+    rng = np.random.default_rng(7)
+    users = random_users(MAX_USERS, payload_size=1, mcs=(5, 6, 7, 25, 26, 27), crc_flags=(0, 1, 2, 3), rng=rng)
+
+    for m in (get_matrix('data/tfMatrix.csv'), build_matrix(1, users, n_symbols=40, noise_var=0.2, rng=rng)):
+        expected = DecodeMatrix(m).decode_all()
+
+        for parallel in ('thread', 'process'):
+            assert DecodeMatrix(m).decode_all(parallel, 3) == expected
@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 
 ##-Imports
+import numpy as np
+
 from src.hamming748 import Hamming748
 from tests.utils import *
 
@@ -45,5 +47,40 @@ def test_hammingDecode():
     # assert hamming748_decode([0, 1, 0, 1, 0, 0, 1, 1]) != [0, 0, 1, 1]
     # assert hamming748_decode([0, 1, 0, 0, 1, 1, 0, 1]) != [0, 0, 1, 0]
 
+def test_hammingDecodeArray():
+    x, corrected, dropped = Hamming748().decode_array(np.array([1, 1, 0, 1, 0, 0, 1, 0, 1, 0, 1, 1, 1, 1, 1, 1, 1, 0, 1, 1, 0, 0, 1, 0]))
+
+    assert x.tolist() == [1, 1, 0, 1, 1, 1, 1, 1, 1, 0, 1, 1]
+    assert corrected.tolist() == [False, True, False]
+    assert dropped.tolist() == [False, False, True]
+
+    # Same results as the block by block decoding
+    h = Hamming748()
+    for c in range(256):
+        y = [(c >> (7 - k)) & 1 for k in range(8)]
+        x, _, dropped = h.decode_array(y)
+
+        if not dropped[0]:
+            assert x.tolist() == h.decode_block(y)
+
+def test_hammingEncode():
+    h = Hamming748()
+
+    # The codewords of the decoding tests
+    assert h.encode([1, 1, 0, 1]) == [1, 1, 0, 1, 0, 0, 1, 0]
+    assert h.encode([0, 0, 1, 0, 0, 1, 1, 1]) == [0, 0, 1, 0, 1, 1, 0, 1, 0, 1, 1, 1, 1, 0, 0, 0]
+
+    # Encoding then decoding gives back the bits, even with one error per codeword
+    bits = np.random.default_rng(0).integers(0, 2, 400)
+    encoded = np.array(h.encode(bits))
+    assert h.decode(encoded) == bits.tolist()
+
+    encoded[::8] ^= 1
+    assert h.decode(encoded) == bits.tolist()
+
+    assert test_error('Hamming748.encode', ValueError, h.encode, [1, 0, 1])
+
 if __name__ == '__main__':
     test_hammingDecode()
+    test_hammingDecodeArray()
+    test_hammingEncode()
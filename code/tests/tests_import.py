@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##-Imports
+import os
+import subprocess
+import sys
+
+##-Constants
+CODE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+HEAVY_MODULES = ('matplotlib', 'pytest', 'sk_dsp_comm', 'scipy') # Only needed to plot (matplotlib) or not needed at all
+IMPORT_BUDGET = 1.0 # Seconds. Much more than needed (numpy is the only heavy import), so that the test is not flaky.
+
+##-Tests
+def test_import_time():
+    # The decoder is imported in a fresh interpreter, as when the CLI starts
+    script = (
+        'import sys, time\n'
+        't0 = time.perf_counter()\n'
+        'import main, src.decode, src.generator, src.stream\n'
+        'print(time.perf_counter() - t0)\n'
+        f'print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n'
+    )
+
+    out = subprocess.run([sys.executable, '-c', script], cwd=CODE_DIR, capture_output=True, text=True, check=True).stdout.split('\n')
+
+    assert out[1] == '', f'imported at startup: {out[1]}'
+    assert float(out[0]) < IMPORT_BUDGET, f'import time: {float(out[0]):.3f} s'
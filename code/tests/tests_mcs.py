@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##-Imports
+from src.demod import qam16_demod_array
+from src.mcs import PDSCH_MCS_TABLE, PDCCHU_nb_of_rb, get_PDCCHU_mcs, get_PDSCH_mcs
+from tests.utils import test_error
+
+##-Tests
+def test_mcs_table():
+    assert sorted(PDSCH_MCS_TABLE) == [5, 6, 7, 25, 26, 27]
+
+    entry = get_PDSCH_mcs(7)
+    assert entry['demod'] is qam16_demod_array
+    assert (entry['bits_per_symbol'], entry['code'], entry['rate']) == (4, 'conv', 1/2)
+    assert get_PDSCH_mcs(25)['code'] == 'hamming748'
+
+    # The PDCCHU lengths are derived from the table
+    assert get_PDCCHU_mcs(2)['modulation'] == 'qpsk'
+    assert PDCCHU_nb_of_rb(0) == 6
+    assert PDCCHU_nb_of_rb(2) == 3
+
+    assert test_error('get_PDSCH_mcs', NotImplementedError, get_PDSCH_mcs, 8)
+    assert test_error('get_PDCCHU_mcs', NotImplementedError, get_PDCCHU_mcs, 1)
+    assert test_error('get_PDCCHU_mcs', ValueError, get_PDCCHU_mcs, 4)
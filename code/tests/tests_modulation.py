@@ -24,7 +24,43 @@ def test_qam16():
     assert qam16_demod(np.array([0.9+1j*-0.9,-0.3+1j*0.9,0.9+1j*-0.9,-0.3+1j*-0.9])) == [0, 1, 0, 0, 1, 0, 1, 0, 0, 1, 0, 0, 1, 1, 1, 0]
     assert qam16_demod(np.array([1.1+1j*-0.8,-0.2+1j*0.8,1.2+1j*-0.9,-0.1+1j*-0.8])) == [0, 1, 0, 0, 1, 0, 1, 0, 0, 1, 0, 0, 1, 1, 1, 0]
 
+def test_demod_array():
+    # The vectorized demodulators return uint8 arrays
+    v = np.array([-0.9+1j*-0.9,-0.3+1j*0.3,-0.3+1j*0.9,-0.9+1j*-0.3])
+
+    assert bpsk_demod_array(v).dtype == np.uint8
+    assert bpsk_demod_array(v).tolist() == [0, 0, 0, 0]
+    assert qpsk_demod_array(v).tolist() == [0, 0, 0, 1, 0, 1, 0, 0]
+    assert qam16_demod_array(v).tolist() == [1, 1, 0, 0, 1, 0, 1, 1, 1, 0, 1, 0, 1, 1, 0, 1]
+    assert qam16_demod_array(np.zeros(0, dtype=complex)).tolist() == []
+
+def test_llr():
+    # The sign of the LLRs gives the hard decisions
+    v = np.array([1.1+1j*-0.8,-0.2+1j*0.8,1.2+1j*-0.9,-0.1+1j*-0.8,-0.9+1j*0.3])
+
+    assert ((bpsk_llr(v) > 0) == bpsk_demod_array(v)).all()
+    assert ((qpsk_llr(v) > 0) == qpsk_demod_array(v)).all()
+    assert ((qam16_llr(v) > 0) == qam16_demod_array(v)).all()
+
+    # A symbol closer to the threshold gives a smaller LLR
+    llr = bpsk_llr(np.array([1.0, 0.1, -1.0]), noise_var=1.0)
+    assert llr[0] > llr[1] > 0 > llr[2]
+
+def test_modulate():
+    # The modulation is the inverse of the hard demodulation
+    bits = np.random.default_rng(0).integers(0, 2, 96)
+
+    assert (bpsk_demod_array(modulate_array(bits, 1)) == bits).all()
+    assert (qpsk_demod_array(modulate_array(bits, 2)) == bits).all()
+    assert (qam16_demod_array(modulate_array(bits, 4)) == bits).all()
+
+    assert np.allclose(modulate_array([1, 0], 1), [1, -1])
+    assert np.allclose(np.mean(np.abs(modulate_array(bits, 4))**2), 1, atol=0.3) # Unit mean energy
+
 if __name__ == '__main__':
     test_bpsk()
     test_qpsk()
     test_qam16()
+    test_demod_array()
+    test_llr()
+    test_modulate()
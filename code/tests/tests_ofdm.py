@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##-Imports
+import os
+import tempfile
+
+import numpy as np
+
+from src.capture import load_matrix
+from src.channel import equalize_matrix
+from src.decode import DecodeMatrix
+from src.ofdm import N_CP, find_timing, ofdm_demodulate, ofdm_modulate, write_iq
+from src.utils import N_FFT, crop_subcarriers, expand_subcarriers, get_matrix
+from tests.utils import test_error
+
+##-Tests
+def test_ofdm_roundtrip():
+    m = get_matrix('data/tfMatrix.csv')
+
+    assert np.array_equal(crop_subcarriers(expand_subcarriers(m)), m)
+
+    samples = ofdm_modulate(m)
+    assert samples.shape == (14 * (N_FFT + N_CP),)
+    assert find_timing(samples) == N_CP
+    assert np.allclose(ofdm_demodulate(samples), m)
+
+    assert test_error('find_timing', ValueError, find_timing, np.zeros(8))
+    assert test_error('ofdm_demodulate', ValueError, ofdm_demodulate, np.zeros(8), 0, 2)
+
+def test_ofdm_timing():
+    # The capture starts at an unknown time, with noise
+    rng = np.random.default_rng(4)
+    m = get_matrix('data/tfMatrix.csv')
+    offset = 777
+
+    samples = np.concatenate((np.zeros(offset), ofdm_modulate(m), np.zeros(100)))
+    samples = samples + 0.003 * (rng.standard_normal(len(samples)) + 1j * rng.standard_normal(len(samples)))
+
+    assert find_timing(samples) == offset + N_CP
+
+    res = DecodeMatrix(ofdm_demodulate(samples)).decode_all()
+    assert res == DecodeMatrix(m).decode_all()
+
+    # A start inside the cyclic prefix rotates the phase of the subcarriers, which is corrected by the equalization
+    early = ofdm_demodulate(samples, offset + N_CP - 5, 14)
+    assert DecodeMatrix(equalize_matrix(early)).decode_all() == res
+
+def test_iq_file():
+    m = get_matrix('data/tfMatrix.csv')
+
+    with tempfile.TemporaryDirectory() as d:
+        fn = os.path.join(d, 'm.cf32')
+        write_iq(fn, np.concatenate((np.zeros(300), ofdm_modulate(m))))
+
+        assert np.allclose(load_matrix(fn), m, atol=1e-4)
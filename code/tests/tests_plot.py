@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##-Imports
+import numpy as np
+
+from src.utils import block_average
+
+##-Tests
+def test_block_average():
+    grid = np.arange(7 * 10, dtype=np.float64).reshape(7, 10)
+
+    # Already small enough
+    assert block_average(grid, (7, 10)) is grid
+
+    # Blocks of 2 x 5 (the last row of blocks has a single row)
+    avg = block_average(grid, (4, 2))
+    assert avg.shape == (4, 2)
+    assert avg[0, 0] == grid[:2, :5].mean()
+    assert avg[3, 1] == grid[6, 5:].mean()
+
+    # The mean power is kept when the blocks divide the grid
+    power = np.random.default_rng(5).random((1400, 624))
+    assert np.isclose(block_average(power, (100, 312)).mean(), power.mean())
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##-Imports
+from concurrent.futures import ThreadPoolExecutor
+
+from src.crc import get_crc, get_crc_poly
+from src.hamming748 import Hamming748
+from src.registry import CodecRegistry, registry
+from src.viterbi import ViterbiDecoder
+from tests.utils import test_error
+
+##-Tests
+def test_registry():
+    # Each codec is built once, and shared
+    assert isinstance(registry.fec(7), ViterbiDecoder)
+    assert isinstance(registry.fec(27), Hamming748)
+    assert registry.fec(5) is registry.fec(7) is registry.viterbi()
+    assert registry.fec(25) is registry.hamming748()
+    assert registry.crc(2) is registry.crc(2)
+    assert registry.crc(2).size == 24
+    assert registry.crc(2) is get_crc(24) # The engines of `src.crc` are not built twice
+    assert registry.demod(7)[1] == 4
+
+    assert get_crc_poly(8) is get_crc_poly(8)
+
+    assert test_error('registry.fec', NotImplementedError, registry.fec, 10)
+    assert test_error('registry.demod', NotImplementedError, registry.demod, 8)
+
+def test_registry_threads():
+    # Concurrent first uses build a single codec
+    r = CodecRegistry()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        codecs = list(executor.map(lambda k: (r.fec(5 + k % 3), r.crc(k % 4)), range(64)))
+
+    assert len({id(fec) for fec, _ in codecs}) == 1
+    assert len({id(crc) for _, crc in codecs}) == 4
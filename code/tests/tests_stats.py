@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##-Imports
+from src.decode import DecodeMatrix
+from src.stats import STAGES, Stats
+
+##-Tests
+def test_stats_disabled(matrix):
+    d = DecodeMatrix(matrix)
+    d.decode_all()
+
+    assert d.get_stats() is None
+
+def test_stats(matrix):
+    d = DecodeMatrix(matrix, stats=True)
+    users = d.decode_all()
+    stats = d.get_stats()
+
+    assert set(stats['times']) == set(STAGES)
+    assert all(t >= 0 for t in stats['times'].values())
+
+    counters = stats['counters']
+    decoded = [user for user in users if user['error'] is None]
+
+    assert counters['crc_checked'] == len(decoded)
+    assert counters['crc_failed'] == sum(not user['crc_ok'] for user in decoded)
+    assert counters['symbols_demodulated'] > 0
+    assert counters['codewords_decoded'] > 0
+    assert counters['viterbi_blocks_decoded'] == sum(user['pdcchu']['mcs'] // 5 == 1 for user in decoded)
+
+    # The counters do not depend on the way the PDSCH are decoded
+    d = DecodeMatrix(matrix, stats=True)
+    d.decode_all('process', 2)
+    assert d.get_stats()['counters'] == counters
+
+def test_stats_merge():
+    s = Stats()
+    s.count('crc_failed')
+    s.add_time('fec', 1.0)
+
+    s.merge(s.as_dict())
+
+    assert s.as_dict()['counters']['crc_failed'] == 2
+    assert s.as_dict()['times']['fec'] == 2.0
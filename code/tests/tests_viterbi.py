@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##-Imports
+import numpy as np
+
+from src.viterbi import ViterbiDecoder, conv_encode
+
+##-Tests
+def test_conv_encode():
+    # Impulse response : the two generator polynomials, interleaved
+    assert conv_encode([1, 0, 0, 0, 0, 0, 0]).tolist() == [1, 1, 0, 1, 1, 1, 1, 1, 0, 0, 1, 0, 1, 1]
+    assert conv_encode([]).tolist() == []
+
+def test_viterbi_decode():
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2, 200)
+    encoded = conv_encode(bits)
+
+    d = ViterbiDecoder()
+
+    # Without errors (the last 5 bits are not output)
+    assert d.decode(encoded).tolist() == bits[:-5].tolist()
+
+    # With a few errors, far from each other
+    noisy = encoded.copy()
+    noisy[[10, 100, 250, 350]] ^= 1
+    assert d.decode(noisy).tolist() == bits[:-5].tolist()
+
+    # Soft decisions (LLR, positive for a 1)
+    llr = (2.0 * encoded - 1) * rng.uniform(0.1, 2, len(encoded))
+    llr[[20, 21, 200]] *= -0.2
+    assert d.decode(llr, 'soft').tolist() == bits[:-5].tolist()
+
+    # Batch
+    batch = d.decode_batch(np.stack([encoded, noisy]))
+    assert batch.shape == (2, 195)
+    assert (batch == bits[:-5]).all()
+
+if __name__ == '__main__':
+    test_conv_encode()
+    test_viterbi_decode()